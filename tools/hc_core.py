@@ -15,55 +15,101 @@ Stability fixes:
 
 from __future__ import annotations
 
-import copy
+import atexit
+import contextlib
+import functools
 import json
+import os
+import re
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Callable, List, Optional, Set, Tuple
+from types import MappingProxyType
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-import serial
 from serial import Serial, SerialException
-from serial.tools import list_ports
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from serial.tools.list_ports_common import ListPortInfo
 
 
 Logger = Callable[[str], None]
 
-LINE_ENDINGS = {"crlf": b"\r\n", "none": b""}
+LINE_ENDINGS = MappingProxyType({"crlf": b"\r\n", "none": b""})
+
+# Upper bound for a single read, and the driver RX buffer requested on open
+# (INQ / address-list dumps can exceed 1 KB on some firmwares).
+_READ_CHUNK = 4096
+_RX_BUFFER_SIZE = 16384
 
+_ADDR_RE = re.compile(r"([0-9A-F]{4}):([0-9A-F]{2}):([0-9A-F]{6})", re.IGNORECASE)
+# OK/ERROR are matched on raw reply bytes (no decode needed). No word boundaries:
+# HC-06 firmwares answer "OKsetname", "OK1234", "OKlinvorV1.8".
+_OK_RE = re.compile(rb"OK", re.IGNORECASE)
+_ERROR_RE = re.compile(rb"ERROR", re.IGNORECASE)
+_ROLE_RE = re.compile(r"ROLE", re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+# AT+PSWD / AT+PIN take four ASCII digits; str.isdigit() would also accept "١٢٣٤" or "²".
+_PIN_RE = re.compile(r"[0-9]{4}")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SerialProfile:
     baud: int
     line_ending: str  # "crlf" or "none"
 
 
-DETECTION_PROFILES = [
+DETECTION_PROFILES = (
     SerialProfile(baud=38400, line_ending="crlf"),  # common HC-05 AT mode
     SerialProfile(baud=9600, line_ending="none"),  # common HC-06 AT mode
     SerialProfile(baud=38400, line_ending="none"),  # fallback
     SerialProfile(baud=9600, line_ending="crlf"),  # fallback
-]
+)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DetectionResult:
     module: str  # "hc05" or "hc06" (best-effort)
     profile: SerialProfile
     role_response: str
 
 
+@functools.lru_cache(maxsize=16)
 def describe_profile(profile: SerialProfile) -> str:
     ending = profile.line_ending.upper()
     return f"{profile.baud} baud, line ending {ending}"
 
 
-def list_serial_ports() -> List[list_ports.ListPortInfo]:
-    return list(list_ports.comports())
+def list_serial_ports(*, wired_only: bool = False) -> List["ListPortInfo"]:
+    """
+    wired_only drops ports an HC module in AT mode cannot sit behind: on macOS
+    the Bluetooth /dev/cu.* nodes, which are also the slow ones to open/probe.
+    Windows (SetupAPI "Ports" class) and Linux already list real UARTs only.
+    """
+    # Imported on demand: list_ports pulls in platform enumeration code that
+    # plain setup/pair runs never need.
+    from serial.tools import list_ports
+
+    ports = list(list_ports.comports())
+    if wired_only and sys.platform == "darwin":
+        ports = [p for p in ports if _is_usb_port(p)]
+    return ports
+
+
+def _is_usb_port(port_info: "ListPortInfo") -> bool:
+    # macOS also lists every Bluetooth serial service (Bluetooth-Incoming-Port, paired
+    # phones) as /dev/cu.*. Node names vary by driver (cu.SLAB_USBtoUART, cu.wchusbserial*),
+    # so go by the USB vendor id / "USB VID:PID=..." hwid that IOKit reports instead.
+    return port_info.vid is not None or "usb" in (port_info.hwid or "").lower()
 
 
-def format_port_entry(port_info: list_ports.ListPortInfo) -> str:
+def format_port_entry(port_info: "ListPortInfo") -> str:
     parts = [port_info.device]
     desc = port_info.description
     hwid = port_info.hwid
@@ -74,35 +120,88 @@ def format_port_entry(port_info: list_ports.ListPortInfo) -> str:
     return " ".join(parts)
 
 
-def read_response(
+def _read_available(ser: Serial) -> bytes:
+    """
+    Wait (up to ser.timeout) for the first byte, then take everything already
+    buffered in one read. A fixed large read size would instead block for the
+    whole timeout on every call, since pyserial waits for the full count.
+    """
+    data = ser.read(1)
+    if data:
+        waiting = ser.in_waiting
+        if waiting:
+            data += ser.read(min(_READ_CHUNK, waiting))
+    return data
+
+
+def _open_port(port: str, baud: int, *, timeout: float) -> Serial:
+    ser = Serial(port, baudrate=baud, timeout=timeout, write_timeout=1)
+    # Only the Windows backend exposes set_buffer_size; the default RX queue is 4 KB there.
+    set_buffer_size = getattr(ser, "set_buffer_size", None)
+    if set_buffer_size is not None:
+        try:
+            set_buffer_size(rx_size=_RX_BUFFER_SIZE)
+        except (SerialException, ValueError):
+            pass
+    return ser
+
+
+def read_response_bytes(
     ser: Serial, *, timeout_ms: int = 2000, quiet_gap_ms: int = 200
-) -> str:
-    start = time.time()
-    last_data = start
+) -> bytes:
+    start = time.monotonic()
     chunks = bytearray()
 
     timeout_s = max(0.1, timeout_ms / 1000.0)
     quiet_gap_s = max(0.01, quiet_gap_ms / 1000.0)
 
-    while time.time() - start < timeout_s:
-        waiting = ser.in_waiting
-        data = ser.read(waiting or 1)
-        if data:
-            chunks.extend(data)
-            last_data = time.time()
-            continue
-        if chunks and (time.time() - last_data) >= quiet_gap_s:
-            break
+    # Block in the driver for at most one quiet gap per read instead of spinning
+    # on in_waiting: an empty read after data means the reply has gone quiet.
+    prev_timeout = ser.timeout
+    ser.timeout = quiet_gap_s
+    try:
+        while time.monotonic() - start < timeout_s:
+            data = _read_available(ser)
+            if data:
+                chunks.extend(data)
+                continue
+            if chunks:
+                break
+    finally:
+        ser.timeout = prev_timeout
+
+    return bytes(chunks)
 
+
+def read_response(
+    ser: Serial, *, timeout_ms: int = 2000, quiet_gap_ms: int = 200
+) -> str:
+    raw = read_response_bytes(ser, timeout_ms=timeout_ms, quiet_gap_ms=quiet_gap_ms)
     try:
-        return chunks.decode("utf-8", errors="ignore")
+        return raw.decode("utf-8", errors="ignore")
     except Exception:
         return ""
 
 
+def _cancellable_sleep(stop_event, seconds: float) -> bool:
+    """Sleep up to `seconds`; returns True as soon as stop_event is set."""
+    if stop_event is None:
+        time.sleep(seconds)
+        return False
+    return stop_event.wait(seconds)
+
+
+def _discard_stale_input(ser: Serial) -> None:
+    # Nothing buffered is the common case: skip the flush and the settle delay.
+    if not ser.in_waiting:
+        return
+    time.sleep(0.02)  # let in-flight bytes land before discarding
+    ser.reset_input_buffer()
+
+
 def send_command(
     ser: Serial,
-    command: str,
+    command: Union[str, bytes],
     profile: SerialProfile,
     *,
     expect_ok: bool = True,
@@ -114,17 +213,24 @@ def send_command(
 ) -> Tuple[bool, str]:
     response: str = ""
     line_bytes = LINE_ENDINGS[profile.line_ending]
+    # Built once and reused on every retry; pre-encoded commands skip the encode.
+    if isinstance(command, bytes):
+        payload = command + line_bytes
+        command = command.decode("ascii", errors="ignore")
+    else:
+        payload = command.encode("ascii", errors="ignore") + line_bytes
+    log_line = f">> {command} ({describe_profile(profile)})"
+    # Retry backoff: start at one quiet gap, double per attempt, cap at 200 ms.
+    delay = min(0.2, max(0.01, quiet_gap_ms / 1000.0))
 
     for attempt in range(1, retries + 1):
         if stop_event is not None and stop_event.is_set():
             logger(".. cancelled")
             return False, response
 
-        ser.reset_input_buffer()
-        time.sleep(0.05)
+        _discard_stale_input(ser)
 
-        payload = command.encode("ascii", errors="ignore") + line_bytes
-        logger(f">> {command} ({describe_profile(profile)})")
+        logger(log_line)
         try:
             ser.write(payload)
             ser.flush()
@@ -132,27 +238,98 @@ def send_command(
             logger(f"!! Write failed: {exc}")
             return False, response
 
-        response = read_response(ser, timeout_ms=timeout_ms, quiet_gap_ms=quiet_gap_ms)
+        raw = read_response_bytes(ser, timeout_ms=timeout_ms, quiet_gap_ms=quiet_gap_ms)
+        response = raw.decode("utf-8", errors="ignore")
         if response.strip():
             logger(f"<< {response.strip()}")
         else:
             logger("<< (no response)")
 
         if expect_ok:
-            if "OK" in response.upper():
+            if _OK_RE.search(raw):
                 return True, response
         else:
             return True, response
 
         if attempt < retries:
             logger(".. retrying ..")
-            time.sleep(0.25)
+            if _cancellable_sleep(stop_event, delay):
+                logger(".. cancelled")
+                return False, response
+            delay = min(0.2, delay * 2)
 
     return False, response
 
 
+def send_command_batch(
+    ser: Serial,
+    commands: List[str],
+    profile: SerialProfile,
+    *,
+    timeout_ms: int = 2000,
+    quiet_gap_ms: int = 200,
+    logger: Logger = print,
+    stop_event=None,
+) -> Tuple[bool, str]:
+    """
+    Write several AT commands in one go and wait for one OK per command.
+    Only meaningful with a CRLF line ending (the module splits commands on it).
+    Returns (all_ok, combined_response); callers fall back to per-command sends on False.
+    """
+    if stop_event is not None and stop_event.is_set():
+        logger(".. cancelled")
+        return False, ""
+
+    line_bytes = LINE_ENDINGS[profile.line_ending]
+    payload = b"".join(cmd.encode("ascii", errors="ignore") + line_bytes for cmd in commands)
+
+    _discard_stale_input(ser)
+
+    logger(f">> {' | '.join(commands)} ({describe_profile(profile)})")
+    try:
+        ser.write(payload)
+        ser.flush()
+    except SerialException as exc:
+        logger(f"!! Write failed: {exc}")
+        return False, ""
+
+    # Replies arrive one per command with processing gaps in between, so keep
+    # reading until every OK is in, an ERROR shows up, or the budget runs out.
+    raw = bytearray()
+    deadline = time.monotonic() + max(0.1, timeout_ms / 1000.0)
+    while True:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            break
+        part = read_response_bytes(ser, timeout_ms=remaining_ms, quiet_gap_ms=quiet_gap_ms)
+        if not part:
+            break
+        raw.extend(part)
+        if len(_OK_RE.findall(raw)) >= len(commands) or _ERROR_RE.search(raw):
+            break
+
+    response = raw.decode("utf-8", errors="ignore")
+    if response.strip():
+        logger(f"<< {response.strip()}")
+    else:
+        logger("<< (no response)")
+
+    ok = len(_OK_RE.findall(raw)) >= len(commands) and not _ERROR_RE.search(raw)
+    return ok, response
+
+
+def _discard_log(msg: str) -> None:
+    pass
+
+
 def _prefixed_logger(logger: Logger, prefix: str) -> Logger:
-    return lambda msg: logger(f"[{prefix}] {msg}")
+    # Bind the joined prefix and logger as defaults: plain locals on every log line.
+    return lambda msg, _p=f"[{prefix}] ", _l=logger: _l(_p + msg)
+
+
+def is_valid_pin(pin: str) -> bool:
+    """True if pin is exactly four ASCII digits."""
+    return _PIN_RE.fullmatch(pin) is not None
 
 
 def parse_addr_response(resp: str) -> Optional[Tuple[str, str]]:
@@ -160,9 +337,7 @@ def parse_addr_response(resp: str) -> Optional[Tuple[str, str]]:
     Parse address from responses like '+ADDR:1234:56:ABCDEF' or '+INQ:1234:56:ABCDEF,...'
     Returns (colon_format, comma_format)
     """
-    import re
-
-    m = re.search(r"([0-9A-F]{4}):([0-9A-F]{2}):([0-9A-F]{6})", resp, re.IGNORECASE)
+    m = _ADDR_RE.search(resp)
     if not m:
         return None
     a, b, c = m.groups()
@@ -171,6 +346,67 @@ def parse_addr_response(resp: str) -> Optional[Tuple[str, str]]:
     return colon, comma
 
 
+def _detect_on_port(
+    port: str,
+    profiles: Optional[List[SerialProfile]],
+    *,
+    logger: Logger,
+    stop_event,
+) -> Tuple[Optional[DetectionResult], Optional[Serial]]:
+    """
+    Probe profiles on a single open handle (re-clocked per profile).
+    On success the still-open Serial is returned so callers can configure
+    without paying another port open; the caller must close it.
+    """
+    profiles = profiles or _profiles_for_port(port)
+    ser: Optional[Serial] = None
+    try:
+        for profile in profiles:
+            if stop_event is not None and stop_event.is_set():
+                logger(".. detect cancelled")
+                return None, None
+
+            logger(f"Probing {port} with {describe_profile(profile)} ...")
+            if ser is None:
+                ser = _open_port(port, profile.baud, timeout=0.6)
+            elif ser.baudrate != profile.baud:
+                ser.baudrate = profile.baud
+
+            ok, _ = send_command(
+                ser,
+                "AT",
+                profile,
+                expect_ok=True,
+                retries=2,
+                timeout_ms=2000,
+                logger=logger,
+                stop_event=stop_event,
+            )
+            if not ok:
+                continue
+
+            _, role_resp = send_command(
+                ser,
+                "AT+ROLE?",
+                profile,
+                expect_ok=False,
+                timeout_ms=2000,
+                logger=logger,
+                stop_event=stop_event,
+            )
+            module = "hc05" if _ROLE_RE.search(role_resp) else "hc06"
+            _remember_profile(port, profile)
+            opened, ser = ser, None
+            return DetectionResult(module=module, profile=profile, role_response=role_resp), opened
+
+    except SerialException as exc:
+        logger(f"!! Could not open {port}: {exc}")
+    finally:
+        if ser is not None:
+            ser.close()
+    return None, None
+
+
 def detect_module(
     port: str,
     profiles: List[SerialProfile] = None,
@@ -178,50 +414,40 @@ def detect_module(
     logger: Logger = print,
     stop_event=None,
 ) -> Optional[DetectionResult]:
-    profiles = profiles or DETECTION_PROFILES
-    for profile in profiles:
-        if stop_event is not None and stop_event.is_set():
-            logger(".. detect cancelled")
-            return None
+    detection, ser = _detect_on_port(port, profiles, logger=logger, stop_event=stop_event)
+    if ser is not None:
+        ser.close()
+    return detection
 
-        logger(f"Probing {port} with {describe_profile(profile)} ...")
-        try:
-            with serial.Serial(
-                port,
-                baudrate=profile.baud,
-                timeout=0.6,
-                write_timeout=1,
-            ) as ser:
-                ok, _ = send_command(
-                    ser,
-                    "AT",
-                    profile,
-                    expect_ok=True,
-                    retries=2,
-                    timeout_ms=2000,
-                    logger=logger,
-                    stop_event=stop_event,
-                )
-                if not ok:
-                    continue
-
-                _, role_resp = send_command(
-                    ser,
-                    "AT+ROLE?",
-                    profile,
-                    expect_ok=False,
-                    timeout_ms=2000,
-                    logger=logger,
-                    stop_event=stop_event,
-                )
-                if "ROLE" in role_resp.upper():
-                    return DetectionResult(module="hc05", profile=profile, role_response=role_resp)
-                return DetectionResult(module="hc06", profile=profile, role_response=role_resp)
 
-        except SerialException as exc:
-            logger(f"!! Could not open {port}: {exc}")
-            break
-    return None
+def detect_modules(
+    ports: List[str],
+    *,
+    max_workers: int = 4,
+    logger: Logger = print,
+    stop_event=None,
+) -> Dict[str, Optional[DetectionResult]]:
+    """
+    Run detect_module on several ports concurrently (one thread and one Serial
+    handle per port). Probing is almost all blocking serial I/O, which releases
+    the GIL, so the per-port waits overlap instead of adding up.
+    Log lines are prefixed with the port; results keep the order of `ports`.
+    """
+    unique = list(dict.fromkeys(ports))
+    if not unique:
+        return {}
+    workers = max(1, min(max_workers, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hc-detect") as pool:
+        futures = {
+            port: pool.submit(
+                detect_module,
+                port,
+                logger=_prefixed_logger(logger, port),
+                stop_event=stop_event,
+            )
+            for port in unique
+        }
+        return {port: fut.result() for port, fut in futures.items()}
 
 
 HC06_BAUD_MAP = {
@@ -238,6 +464,16 @@ HC06_BAUD_MAP = {
     921600: "B",
     1382400: "C",
 }
+HC06_BAUD_SET = frozenset(HC06_BAUD_MAP)
+# Ready-to-send AT+BAUDx payloads (line ending is appended by send_command).
+HC06_BAUD_CMD = {b: f"AT+BAUD{c}".encode("ascii") for b, c in HC06_BAUD_MAP.items()}
+
+
+def _port_or_open(ser: Optional[Serial], port: str, profile: SerialProfile):
+    """Reuse an already-open handle (left open for the caller) or open a fresh one."""
+    if ser is not None:
+        return contextlib.nullcontext(ser)
+    return _open_port(port, profile.baud, timeout=0.6)
 
 
 def configure_hc05(
@@ -250,9 +486,10 @@ def configure_hc05(
     role: str,
     logger: Logger = print,
     stop_event=None,
+    ser: Optional[Serial] = None,
 ) -> bool:
     try:
-        with serial.Serial(port, baudrate=profile.baud, timeout=0.6, write_timeout=1) as ser:
+        with _port_or_open(ser, port, profile) as ser:
             ok, _ = send_command(ser, "AT", profile, retries=2, logger=logger, stop_event=stop_event)
             if not ok:
                 logger("!! HC-05 did not confirm AT. Check AT mode wiring and baud/ending.")
@@ -312,9 +549,10 @@ def configure_hc06(
     baud: int,
     logger: Logger = print,
     stop_event=None,
+    ser: Optional[Serial] = None,
 ) -> bool:
     try:
-        with serial.Serial(port, baudrate=profile.baud, timeout=0.6, write_timeout=1) as ser:
+        with _port_or_open(ser, port, profile) as ser:
             ok, _ = send_command(ser, "AT", profile, retries=2, logger=logger, stop_event=stop_event)
             if not ok:
                 logger("!! HC-06 did not confirm AT. Check wiring and baud/ending.")
@@ -348,15 +586,14 @@ def configure_hc06(
                 logger(".. cancelled")
                 return False
 
-            if baud not in HC06_BAUD_MAP:
+            if baud not in HC06_BAUD_SET:
                 logger(
                     f"!! Baud {baud} not in common HC-06 BAUD table. "
                     "Firmware mappings differ; try a supported value or set manually."
                 )
                 return False
 
-            code = HC06_BAUD_MAP[baud]
-            ok, _ = send_command(ser, f"AT+BAUD{code}", profile, logger=logger, stop_event=stop_event)
+            ok, _ = send_command(ser, HC06_BAUD_CMD[baud], profile, logger=logger, stop_event=stop_event)
             if not ok:
                 logger("!! Baud change command did not return OK.")
                 return False
@@ -380,7 +617,8 @@ def run_setup(
     logger: Logger = print,
     stop_event=None,
 ) -> Tuple[bool, Optional[DetectionResult]]:
-    detection = detect_module(port, logger=logger, stop_event=stop_event)
+    # Keep the port detection opened for the configure phase (one open per run).
+    detection, ser = _detect_on_port(port, None, logger=logger, stop_event=stop_event)
     if not detection:
         logger(
             "!! Could not detect module. Check wiring (RX/TX swapped?), AT mode, "
@@ -388,38 +626,43 @@ def run_setup(
         )
         return False, None
 
-    detected_type = detection.module
-    logger(f"Detected {detected_type.upper()} using {describe_profile(detection.profile)}")
-    if detection.role_response.strip():
-        logger(f"ROLE? response: {detection.role_response.strip()}")
-    else:
-        logger("ROLE? response: (no data)")
+    try:
+        detected_type = detection.module
+        logger(f"Detected {detected_type.upper()} using {describe_profile(detection.profile)}")
+        if detection.role_response.strip():
+            logger(f"ROLE? response: {detection.role_response.strip()}")
+        else:
+            logger("ROLE? response: (no data)")
 
-    module_to_use = module if module != "auto" else detected_type
-    if module_to_use != detected_type:
-        logger(f"Warning: user forced module={module_to_use}, but detection suggested {detected_type}.")
+        module_to_use = module if module != "auto" else detected_type
+        if module_to_use != detected_type:
+            logger(f"Warning: user forced module={module_to_use}, but detection suggested {detected_type}.")
 
-    if module_to_use == "hc05":
-        ok = configure_hc05(
-            port,
-            detection.profile,
-            name=name,
-            pin=pin,
-            baud=baud,
-            role=role,
-            logger=logger,
-            stop_event=stop_event,
-        )
-    else:
-        ok = configure_hc06(
-            port,
-            detection.profile,
-            name=name,
-            pin=pin,
-            baud=baud,
-            logger=logger,
-            stop_event=stop_event,
-        )
+        if module_to_use == "hc05":
+            ok = configure_hc05(
+                port,
+                detection.profile,
+                name=name,
+                pin=pin,
+                baud=baud,
+                role=role,
+                logger=logger,
+                stop_event=stop_event,
+                ser=ser,
+            )
+        else:
+            ok = configure_hc06(
+                port,
+                detection.profile,
+                name=name,
+                pin=pin,
+                baud=baud,
+                logger=logger,
+                stop_event=stop_event,
+                ser=ser,
+            )
+    finally:
+        ser.close()
 
     return ok, detection
 
@@ -427,9 +670,16 @@ def run_setup(
 # ---------- Pairing helpers ----------
 
 PAIR_CACHE_FILE = Path(__file__).resolve().parent / ".pair_cache.json"
+# Per-port detect profiles; kept apart so a plain detect never rewrites the pair cache.
+PROFILE_CACHE_FILE = Path(__file__).resolve().parent / ".profile_cache.json"
+# Read-modify-write of the cache files can happen from several detect threads.
+_PAIR_CACHE_LOCK = threading.Lock()
+# Pair-cache writes are queued off the pairing path; drained before the process exits.
+_CACHE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hc-cache")
+atexit.register(_CACHE_EXECUTOR.shutdown, wait=True)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Step:
     id: str
     label: str
@@ -446,7 +696,7 @@ class Step:
     quiet_gap_ms: int = 200
 
 
-@dataclass
+@dataclass(slots=True)
 class PairFlags:
     basic: bool = True
     skip_steps: Set[str] = field(default_factory=set)
@@ -461,8 +711,17 @@ class PairFlags:
     no_pair: bool = False  # NEW: allow disabling AT+PAIR entirely
     no_link: bool = False  # NEW: allow disabling AT+LINK entirely
 
+    def clone(self) -> "PairFlags":
+        # Only the containers are mutable; copy them instead of a full deepcopy.
+        return replace(
+            self,
+            skip_steps=set(self.skip_steps),
+            extra_slave_cmds=list(self.extra_slave_cmds),
+            extra_master_cmds=list(self.extra_master_cmds),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class PairContext:
     slave_addr: Optional[Tuple[str, str]] = None
     master_bind_ok: bool = False
@@ -477,6 +736,30 @@ def _now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
+def _read_cache_file(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _store_cache_file(path: Path, payload: dict) -> None:
+    # Skip identical rewrites; otherwise write a sibling temp file and swap it in
+    # so a killed process never leaves a half-written cache behind.
+    new_bytes = json.dumps(payload, indent=2).encode("utf-8")
+    try:
+        if path.exists() and path.read_bytes() == new_bytes:
+            return
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(new_bytes)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
 def _write_pair_cache(addr_colon: str, addr_comma: str, meta: dict) -> None:
     payload = {
         "slave_addr_colon": addr_colon,
@@ -484,20 +767,48 @@ def _write_pair_cache(addr_colon: str, addr_comma: str, meta: dict) -> None:
         "meta": meta,
         "timestamp": _now_iso(),
     }
+    with _PAIR_CACHE_LOCK:
+        _store_cache_file(PAIR_CACHE_FILE, payload)
+
+
+def _read_profile_cache() -> dict:
+    # port -> {"baud", "line_ending"}; anything else (hand-edited, older layout) reads as empty.
+    profiles = _read_cache_file(PROFILE_CACHE_FILE).get("last_profile")
+    return profiles if isinstance(profiles, dict) else {}
+
+
+def _cached_profile(port: str) -> Optional[SerialProfile]:
+    entry = _read_profile_cache().get(port)
     try:
-        PAIR_CACHE_FILE.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        profile = SerialProfile(baud=int(entry["baud"]), line_ending=str(entry["line_ending"]))
     except Exception:
-        pass
+        return None
+    return profile if profile.line_ending in LINE_ENDINGS else None
+
+
+def _profiles_for_port(port: str) -> List[SerialProfile]:
+    """DETECTION_PROFILES, with the profile that last worked on this port tried first."""
+    cached = _cached_profile(port)
+    if cached is None:
+        return list(DETECTION_PROFILES)
+    return [cached] + [p for p in DETECTION_PROFILES if p != cached]
+
+
+def _remember_profile(port: str, profile: SerialProfile) -> None:
+    entry = {"baud": profile.baud, "line_ending": profile.line_ending}
+    with _PAIR_CACHE_LOCK:
+        last_profile = _read_profile_cache()
+        if last_profile.get(port) == entry:
+            return
+        last_profile[port] = entry
+        _store_cache_file(PROFILE_CACHE_FILE, {"last_profile": last_profile})
 
 
 def load_last_slave() -> Optional[Tuple[str, str]]:
-    if not PAIR_CACHE_FILE.exists():
-        return None
-    try:
-        data = json.loads(PAIR_CACHE_FILE.read_text(encoding="utf-8"))
-        return data.get("slave_addr_colon"), data.get("slave_addr_comma")
-    except Exception:
+    data = _read_cache_file(PAIR_CACHE_FILE)
+    if not data.get("slave_addr_colon"):
         return None
+    return data["slave_addr_colon"], data.get("slave_addr_comma")
 
 
 def _should_include_step(step: Step, flags: PairFlags) -> bool:
@@ -510,9 +821,16 @@ def _should_include_step(step: Step, flags: PairFlags) -> bool:
     return True
 
 
-def _log_plan(prefix: str, steps: List[Step], logger: Logger) -> None:
-    basic_steps = [s for s in steps if s.category == "basic"]
-    extra_steps = [s for s in steps if s.category != "basic"]
+def _split_plan(steps: List[Step]) -> Tuple[List[Step], List[Step]]:
+    """(basic, extra) in plan order; shared by _log_plan and _interactive_tune."""
+    basic_steps: List[Step] = []
+    extra_steps: List[Step] = []
+    for step in steps:
+        (basic_steps if step.category == "basic" else extra_steps).append(step)
+    return basic_steps, extra_steps
+
+
+def _log_plan(prefix: str, basic_steps: List[Step], extra_steps: List[Step], logger: Logger) -> None:
     logger(f"[{prefix}] BASIC STEPS:")
     for idx, step in enumerate(basic_steps, start=1):
         opt = " (optional)" if step.optional else ""
@@ -523,6 +841,55 @@ def _log_plan(prefix: str, steps: List[Step], logger: Logger) -> None:
             logger(f"  - {step.label}")
 
 
+def _gen_slave_steps(
+    module: str,
+    *,
+    name: Optional[str],
+    pin: Optional[str],
+    baud: int,
+    flags: PairFlags,
+    require_addr: bool,
+) -> Iterator[Step]:
+    yield Step("at", "AT", "AT", critical=True, retries=2, timeout_ms=2000)
+    if module == "hc05" and not flags.no_orlg:
+        yield Step("orlg", "AT+ORGL", "AT+ORGL", optional=True, timeout_ms=3000)
+    if module == "hc05":
+        yield Step("role0", "AT+ROLE=0", "AT+ROLE=0", critical=True, timeout_ms=2000)
+    if name:
+        yield Step("name", f"AT+NAME={name}", f"AT+NAME={name}", value=name, timeout_ms=2000)
+    if pin:
+        yield Step("pin", f"AT+PSWD={pin}", f"AT+PSWD={pin}", value=pin, timeout_ms=2000)
+
+    if module == "hc05":
+        yield Step("uart", f"AT+UART={baud},0,0", f"AT+UART={baud},0,0", critical=True, timeout_ms=2000)
+        yield Step(
+            "addr",
+            "AT+ADDR?",
+            "AT+ADDR?",
+            critical=require_addr,
+            optional=not require_addr,
+            expect_ok=False,
+            capture_response=True,
+            timeout_ms=2000,
+        )
+    else:
+        if baud not in HC06_BAUD_SET:
+            raise PairPlanError(
+                f"Baud {baud} not supported by HC-06 BAUD map (choose one of: {', '.join(map(str, HC06_BAUD_MAP.keys()))})."
+            )
+        yield Step("uart", f"AT+BAUD{HC06_BAUD_MAP[baud]}", f"AT+BAUD{HC06_BAUD_MAP[baud]}", critical=True, timeout_ms=2000)
+        yield Step(
+            "addr",
+            "AT+ADDR?",
+            "AT+ADDR?",
+            critical=False,
+            optional=True,
+            expect_ok=False,
+            capture_response=True,
+            timeout_ms=2000,
+        )
+
+
 def build_slave_plan(
     detection: DetectionResult,
     *,
@@ -533,73 +900,102 @@ def build_slave_plan(
     require_addr: bool,
 ) -> List[Step]:
     steps: List[Step] = []
-    module = detection.module
-
     if flags.basic:
-        steps.append(Step("at", "AT", "AT", critical=True, retries=2, timeout_ms=2000))
-        if module == "hc05" and not flags.no_orlg:
-            steps.append(Step("orlg", "AT+ORGL", "AT+ORGL", optional=True, timeout_ms=3000))
-        if module == "hc05":
-            steps.append(Step("role0", "AT+ROLE=0", "AT+ROLE=0", critical=True, timeout_ms=2000))
-        if name:
-            steps.append(Step("name", f"AT+NAME={name}", f"AT+NAME={name}", value=name, timeout_ms=2000))
-        if pin:
-            steps.append(Step("pin", f"AT+PSWD={pin}", f"AT+PSWD={pin}", value=pin, timeout_ms=2000))
-
-        if module == "hc05":
-            steps.append(Step("uart", f"AT+UART={baud},0,0", f"AT+UART={baud},0,0", critical=True, timeout_ms=2000))
-            steps.append(
-                Step(
-                    "addr",
-                    "AT+ADDR?",
-                    "AT+ADDR?",
-                    critical=require_addr,
-                    optional=not require_addr,
-                    expect_ok=False,
-                    capture_response=True,
-                    timeout_ms=2000,
-                )
-            )
-        else:
-            if baud not in HC06_BAUD_MAP:
-                raise PairPlanError(
-                    f"Baud {baud} not supported by HC-06 BAUD map (choose one of: {', '.join(map(str, HC06_BAUD_MAP.keys()))})."
-                )
-            steps.append(
-                Step("uart", f"AT+BAUD{HC06_BAUD_MAP[baud]}", f"AT+BAUD{HC06_BAUD_MAP[baud]}", critical=True, timeout_ms=2000)
-            )
-            steps.append(
-                Step(
-                    "addr",
-                    "AT+ADDR?",
-                    "AT+ADDR?",
-                    critical=False,
-                    optional=True,
-                    expect_ok=False,
-                    capture_response=True,
-                    timeout_ms=2000,
-                )
+        steps = [
+            step
+            for step in _gen_slave_steps(
+                detection.module, name=name, pin=pin, baud=baud, flags=flags, require_addr=require_addr
             )
+            if _should_include_step(step, flags)
+        ]
+
+    steps.extend(
+        Step(
+            id=f"extra-slave-{idx}",
+            label=f"Extra (slave) {cmd}",
+            command=cmd,
+            expect_ok=False,
+            optional=True,
+            category="extra",
+            timeout_ms=2500,
+        )
+        for idx, cmd in enumerate(flags.extra_slave_cmds, start=1)
+    )
+    return steps
 
-    filtered: List[Step] = []
-    for step in steps:
-        if _should_include_step(step, flags):
-            filtered.append(step)
-
-    for idx, cmd in enumerate(flags.extra_slave_cmds, start=1):
-        filtered.append(
-            Step(
-                id=f"extra-slave-{idx}",
-                label=f"Extra (slave) {cmd}",
-                command=cmd,
-                expect_ok=False,
-                optional=True,
-                category="extra",
-                timeout_ms=2500,
-            )
+
+def _gen_master_steps(
+    *,
+    name: Optional[str],
+    pin: Optional[str],
+    baud: int,
+    flags: PairFlags,
+    slave_addr: Optional[Tuple[str, str]],
+    want_scan: bool,
+    require_link: bool,
+) -> Iterator[Step]:
+    addr_text = slave_addr[1] if slave_addr else "{addr}"
+
+    yield Step("at", "AT", "AT", critical=True, retries=2, timeout_ms=2000)
+    yield Step("role1", "AT+ROLE=1", "AT+ROLE=1", critical=True, timeout_ms=2000)
+    yield Step("cmode", "AT+CMODE=0", "AT+CMODE=0", critical=True, timeout_ms=2000)
+
+    if name:
+        yield Step("name", f"AT+NAME={name}", f"AT+NAME={name}", value=name, timeout_ms=2000)
+    if pin:
+        yield Step("pin", f"AT+PSWD={pin}", f"AT+PSWD={pin}", value=pin, timeout_ms=2000)
+
+    yield Step("uart", f"AT+UART={baud},0,0", f"AT+UART={baud},0,0", critical=True, timeout_ms=2000)
+
+    if not flags.no_rmaad:
+        yield Step("rmaad", "AT+RMAAD", "AT+RMAAD", optional=True, timeout_ms=5000)
+    yield Step("init", "AT+INIT", "AT+INIT", optional=True, timeout_ms=8000)
+
+    if want_scan and not slave_addr:
+        yield Step(
+            "inq",
+            "AT+INQ (scan + pick slave)",
+            "AT+INQ",
+            critical=True,
+            expect_ok=False,
+            kind="inq",
+            timeout_ms=9000,
         )
 
-    return filtered
+    # IMPORTANT: AT+PAIR is OPTIONAL (firmware dependent)
+    if not flags.no_pair:
+        yield Step(
+            "pair",
+            f"AT+PAIR={addr_text},20",
+            f"AT+PAIR={addr_text},20",
+            critical=False,
+            optional=True,
+            timeout_ms=25000,  # must be >= 20s
+            quiet_gap_ms=300,
+        )
+
+    # BIND is the key that makes data-mode auto connect reliable
+    yield Step(
+        "bind",
+        f"AT+BIND={addr_text}",
+        f"AT+BIND={addr_text}",
+        critical=True,
+        timeout_ms=4000,
+    )
+
+    # LINK can fail in mode ONE if SLAVE is unpowered after swap
+    if not flags.no_link:
+        yield Step(
+            "link",
+            f"AT+LINK={addr_text}",
+            f"AT+LINK={addr_text}",
+            critical=require_link,
+            optional=not require_link,
+            timeout_ms=15000,
+            quiet_gap_ms=300,
+        )
+
+    yield Step("reset", "AT+RESET", "AT+RESET", optional=True, expect_ok=False, timeout_ms=3000)
 
 
 def build_master_plan(
@@ -616,98 +1012,35 @@ def build_master_plan(
     if detection.module != "hc05":
         raise PairPlanError("Master must be HC-05 (needs ROLE/PAIR/BIND/LINK).")
 
-    addr_text = slave_addr[1] if slave_addr else "{addr}"
     steps: List[Step] = []
-
     if flags.basic:
-        steps.append(Step("at", "AT", "AT", critical=True, retries=2, timeout_ms=2000))
-        steps.append(Step("role1", "AT+ROLE=1", "AT+ROLE=1", critical=True, timeout_ms=2000))
-        steps.append(Step("cmode", "AT+CMODE=0", "AT+CMODE=0", critical=True, timeout_ms=2000))
-
-        if name:
-            steps.append(Step("name", f"AT+NAME={name}", f"AT+NAME={name}", value=name, timeout_ms=2000))
-        if pin:
-            steps.append(Step("pin", f"AT+PSWD={pin}", f"AT+PSWD={pin}", value=pin, timeout_ms=2000))
-
-        steps.append(Step("uart", f"AT+UART={baud},0,0", f"AT+UART={baud},0,0", critical=True, timeout_ms=2000))
-
-        if not flags.no_rmaad:
-            steps.append(Step("rmaad", "AT+RMAAD", "AT+RMAAD", optional=True, timeout_ms=5000))
-        steps.append(Step("init", "AT+INIT", "AT+INIT", optional=True, timeout_ms=8000))
-
-        if want_scan and not slave_addr:
-            steps.append(
-                Step(
-                    "inq",
-                    "AT+INQ (scan + pick slave)",
-                    "AT+INQ",
-                    critical=True,
-                    expect_ok=False,
-                    kind="inq",
-                    timeout_ms=9000,
-                )
-            )
-
-        # IMPORTANT: AT+PAIR is OPTIONAL (firmware dependent)
-        if not flags.no_pair:
-            steps.append(
-                Step(
-                    "pair",
-                    f"AT+PAIR={addr_text},20",
-                    f"AT+PAIR={addr_text},20",
-                    critical=False,
-                    optional=True,
-                    timeout_ms=25000,  # must be >= 20s
-                    quiet_gap_ms=300,
-                )
-            )
-
-        # BIND is the key that makes data-mode auto connect reliable
-        steps.append(
-            Step(
-                "bind",
-                f"AT+BIND={addr_text}",
-                f"AT+BIND={addr_text}",
-                critical=True,
-                timeout_ms=4000,
-            )
-        )
-
-        # LINK can fail in mode ONE if SLAVE is unpowered after swap
-        if not flags.no_link:
-            steps.append(
-                Step(
-                    "link",
-                    f"AT+LINK={addr_text}",
-                    f"AT+LINK={addr_text}",
-                    critical=require_link,
-                    optional=not require_link,
-                    timeout_ms=15000,
-                    quiet_gap_ms=300,
-                )
-            )
-
-        steps.append(Step("reset", "AT+RESET", "AT+RESET", optional=True, expect_ok=False, timeout_ms=3000))
-
-    filtered: List[Step] = []
-    for step in steps:
-        if _should_include_step(step, flags):
-            filtered.append(step)
-
-    for idx, cmd in enumerate(flags.extra_master_cmds, start=1):
-        filtered.append(
-            Step(
-                id=f"extra-master-{idx}",
-                label=f"Extra (master) {cmd}",
-                command=cmd,
-                expect_ok=False,
-                optional=True,
-                category="extra",
-                timeout_ms=3000,
+        steps = [
+            step
+            for step in _gen_master_steps(
+                name=name,
+                pin=pin,
+                baud=baud,
+                flags=flags,
+                slave_addr=slave_addr,
+                want_scan=want_scan,
+                require_link=require_link,
             )
+            if _should_include_step(step, flags)
+        ]
+
+    steps.extend(
+        Step(
+            id=f"extra-master-{idx}",
+            label=f"Extra (master) {cmd}",
+            command=cmd,
+            expect_ok=False,
+            optional=True,
+            category="extra",
+            timeout_ms=3000,
         )
-
-    return filtered
+        for idx, cmd in enumerate(flags.extra_master_cmds, start=1)
+    )
+    return steps
 
 
 def _inquire_addresses(
@@ -727,24 +1060,36 @@ def _inquire_addresses(
         logger(f"!! Write failed: {exc}")
         return []
 
-    buf = ""
-    start = time.time()
-    while time.time() - start < scan_seconds:
-        if stop_event is not None and stop_event.is_set():
-            logger(".. cancelled")
-            break
-        if ser.in_waiting:
-            chunk = ser.read(ser.in_waiting).decode("utf-8", errors="ignore")
+    buf_parts: List[str] = []
+    start = time.monotonic()
+    # Short blocking reads: return as soon as INQ lines arrive, idle-wait otherwise.
+    prev_timeout = ser.timeout
+    ser.timeout = 0.2
+    try:
+        while time.monotonic() - start < scan_seconds:
+            if stop_event is not None and stop_event.is_set():
+                logger(".. cancelled")
+                break
+            data = _read_available(ser)
+            if not data:
+                continue
+            chunk = data.decode("utf-8", errors="ignore")
             if chunk:
                 logger(f"<< {chunk.strip()}")
-                buf += chunk
-        time.sleep(0.2)
+                buf_parts.append(chunk)
+    finally:
+        ser.timeout = prev_timeout
 
+    # One regex sweep over the whole dump; devices often repeat in INQ output.
+    seen: Set[str] = set()
     addrs: List[Tuple[str, str]] = []
-    for line in buf.splitlines():
-        parsed = parse_addr_response(line)
-        if parsed:
-            addrs.append(parsed)
+    for m in _ADDR_RE.finditer("".join(buf_parts)):
+        a, b, c = m.groups()
+        colon = f"{a}:{b}:{c}".upper()
+        if colon in seen:
+            continue
+        seen.add(colon)
+        addrs.append((f"{a}:{b}:{c}", f"{a},{b},{c}"))
     return addrs
 
 
@@ -784,10 +1129,9 @@ def _execute_step(
 
     cmd = step.command
     if "{addr}" in cmd:
-        if not context.slave_addr:
-            logger("!! Missing slave address; cannot continue.")
-            return False
-        cmd = cmd.replace("{addr}", context.slave_addr[1])
+        # _run_plan_on_port binds {addr} as soon as the address is known.
+        logger("!! Missing slave address; cannot continue.")
+        return False
 
     # Special handling: pin/name/uart/addr for compatibility
     if step.id == "pin":
@@ -846,10 +1190,10 @@ def _execute_step(
 
     if step.id == "uart":
         if module == "hc06":
-            if baud_value not in HC06_BAUD_MAP:
+            if baud_value not in HC06_BAUD_SET:
                 logger(f"!! Baud {baud_value} not supported by HC-06 auto map.")
                 return False
-            cmd = f"AT+BAUD{HC06_BAUD_MAP[baud_value]}"
+            cmd = HC06_BAUD_CMD[baud_value]
         else:
             cmd = f"AT+UART={baud_value},0,0"
         ok, _ = send_command(
@@ -913,6 +1257,46 @@ def _execute_step(
     return ok
 
 
+# Steps with module-specific fallbacks, response parsing, or BIND/LINK bookkeeping
+# always go through _execute_step on their own.
+_UNBATCHED_STEP_IDS = frozenset({"name", "pin", "uart", "addr", "pair", "bind", "link"})
+
+
+def _is_batchable(step: Step) -> bool:
+    return (
+        step.kind == "command"
+        and step.category == "basic"
+        and step.expect_ok
+        and not step.optional
+        and not step.capture_response
+        and step.retries == 1
+        and step.id not in _UNBATCHED_STEP_IDS
+        and "{addr}" not in step.command
+    )
+
+
+def _batch_groups(steps: List[Step], profile: SerialProfile) -> List[List[Step]]:
+    """Split steps into runs of adjacent batchable steps; everything else is a group of one."""
+    if profile.line_ending != "crlf":
+        # Without a terminator the module delimits commands by timing; no batching.
+        return [[step] for step in steps]
+    groups: List[List[Step]] = []
+    for step in steps:
+        if groups and _is_batchable(step) and _is_batchable(groups[-1][-1]):
+            groups[-1].append(step)
+        else:
+            groups.append([step])
+    return groups
+
+
+def _bind_addr(steps: List[Step], addr: str) -> List[Step]:
+    """Materialize {addr} in the given steps once the slave address is known."""
+    return [
+        replace(step, command=step.command.replace("{addr}", addr)) if "{addr}" in step.command else step
+        for step in steps
+    ]
+
+
 def _run_plan_on_port(
     port: str,
     detection: DetectionResult,
@@ -935,75 +1319,149 @@ def _run_plan_on_port(
         return True
 
     try:
-        with serial.Serial(port, baudrate=profile.baud, timeout=0.8, write_timeout=1) as ser:
-            for step in steps:
-                ok = _execute_step(
-                    ser,
-                    profile,
-                    step,
-                    module=detection.module,
-                    context=context,
-                    choose_addr_cb=choose_addr_cb,
-                    logger=logger,
-                    stop_event=stop_event,
-                    name_value=name_value,
-                    pin_value=pin_value,
-                    baud_value=baud_value,
-                )
-                if not ok:
-                    return False
+        with _open_port(port, profile.baud, timeout=0.8) as ser:
+            if context.slave_addr:
+                steps = _bind_addr(steps, context.slave_addr[1])
+            groups = _batch_groups(steps, profile)
+            next_group = 0
+            while next_group < len(groups):
+                group = groups[next_group]
+                next_group += 1
+                if len(group) > 1:
+                    ok, _ = send_command_batch(
+                        ser,
+                        [step.command for step in group],
+                        profile,
+                        timeout_ms=sum(step.timeout_ms for step in group),
+                        quiet_gap_ms=max(step.quiet_gap_ms for step in group),
+                        logger=logger,
+                        stop_event=stop_event,
+                    )
+                    if ok:
+                        continue
+                    if stop_event is not None and stop_event.is_set():
+                        return False
+                    logger(".. batch not fully confirmed; running those steps one by one.")
+
+                for step in group:
+                    known_addr = context.slave_addr
+                    ok = _execute_step(
+                        ser,
+                        profile,
+                        step,
+                        module=detection.module,
+                        context=context,
+                        choose_addr_cb=choose_addr_cb,
+                        logger=logger,
+                        stop_event=stop_event,
+                        name_value=name_value,
+                        pin_value=pin_value,
+                        baud_value=baud_value,
+                    )
+                    if not ok:
+                        return False
+                    if context.slave_addr is not known_addr:
+                        # INQ/ADDR just resolved the address: bind the rest of the plan once.
+                        rest = [pending for later in groups[next_group:] for pending in later]
+                        groups = _batch_groups(_bind_addr(rest, context.slave_addr[1]), profile)
+                        next_group = 0
         return True
     except SerialException as exc:
         logger(f"!! Serial error on port {port}: {exc}")
         return False
 
 
-def _interactive_tune(phase: str, steps: List[Step], flags: PairFlags, *, logger: Logger) -> PairFlags:
-    basic_steps = [s for s in steps if s.category == "basic"]
-    if not basic_steps:
-        return flags
+async def _run_detached(func: Callable, *args):
+    """
+    Run a blocking call (stdin prompt, GUI swap dialog) in a daemon thread and
+    await its result. A daemon thread keeps Ctrl+C from waiting on a pending input().
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _settle(value, exc) -> None:
+        if future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(value)
+
+    def _call() -> None:
+        try:
+            value, exc = func(*args), None
+        except BaseException as err:  # EOFError / KeyboardInterrupt belong to the awaiting task
+            value, exc = None, err
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(_settle, value, exc)
 
+    threading.Thread(target=_call, daemon=True).start()
+    return await future
+
+
+async def _await_probe(task: asyncio.Task, stop_event, probe_stop: threading.Event) -> Optional[DetectionResult]:
+    """Wait for the speculative MASTER detect, forwarding a user cancel to it."""
+    import asyncio
+
+    while not task.done():
+        await asyncio.wait({task}, timeout=0.1)
+        if stop_event is not None and stop_event.is_set():
+            probe_stop.set()
+    return task.result()
+
+
+async def _interactive_tune(
+    phase: str, basic_steps: List[Step], flags: PairFlags, *, logger: Logger
+) -> Tuple[PairFlags, bool]:
+    """
+    Returns (flags, changed); changed is False when the plan needs no rebuild.
+    Callers skip this entirely when the plan has no basic steps.
+    """
+    phase_is_slave = phase.upper() == "SLAVE"
+    changed = False
     while True:
         logger(f"[{phase}] Choose plan (a=all, b=skip steps, c=no-basic, d=add extra).")
-        choice = input(f"{phase} choice [a/b/c/d]: ").strip().lower()
+        choice = (await _run_detached(input, f"{phase} choice [a/b/c/d]: ")).strip().lower()
         if choice in ("", "a"):
             break
         if choice == "c":
+            changed = changed or flags.basic
             flags.basic = False
             break
         if choice == "d":
             logger(f"[{phase}] Enter extra commands (one per line, blank to finish):")
             extras: List[str] = []
             while True:
-                line = input().strip()
+                line = (await _run_detached(input)).strip()
                 if not line:
                     break
                 extras.append(line)
-            if phase.upper() == "SLAVE":
+            changed = changed or bool(extras)
+            if phase_is_slave:
                 flags.extra_slave_cmds.extend(extras)
             else:
                 flags.extra_master_cmds.extend(extras)
         if choice == "b":
-            nums = input(f"{phase} skip steps (e.g. 7,8,12): ").strip()
+            nums = (await _run_detached(input, f"{phase} skip steps (e.g. 7,8,12): ")).strip()
             if nums:
-                for token in nums.split(","):
-                    token = token.strip()
-                    if not token.isdigit():
-                        continue
-                    idx = int(token)
-                    if 1 <= idx <= len(basic_steps):
-                        step = basic_steps[idx - 1]
-                        if step.critical:
-                            logger(f"[{phase}] !! Cannot skip critical step: {step.label}")
-                            continue
-                        flags.skip_steps.add(step.id)
-        again = input(f"{phase} adjust more? (Y/n): ").strip().lower()
+                idx_map = dict(enumerate(basic_steps, start=1))
+                picked = [idx_map[idx] for idx in map(int, _DIGITS_RE.findall(nums)) if idx in idx_map]
+                for step in picked:
+                    if step.critical:
+                        logger(f"[{phase}] !! Cannot skip critical step: {step.label}")
+                new_ids = {step.id for step in picked if not step.critical} - flags.skip_steps
+                if new_ids:
+                    flags.skip_steps |= new_ids
+                    changed = True
+        again = (await _run_detached(input, f"{phase} adjust more? (Y/n): ")).strip().lower()
         if again not in ("y", "yes"):
             break
-    return flags
+    return flags, changed
 
 
-def run_pair(
+async def run_pair_async(
     *,
     mode: str,
     master_port: Optional[str],
@@ -1016,10 +1474,17 @@ def run_pair(
     flags: Optional[PairFlags] = None,
     prompt_swap: Optional[Callable[[str, str], str]] = None,
     choose_addr_cb: Optional[Callable[[List[Tuple[str, str]]], Optional[Tuple[str, str]]]] = None,
-    logger: Logger = print,
+    logger: Optional[Logger] = print,
     stop_event=None,
     return_flags: bool = False,
 ):
+    import asyncio
+
+    # logger=None runs silently; the plan listings are then not even formatted.
+    quiet = logger is None
+    if quiet:
+        logger = _discard_log
+
     flags = flags or PairFlags()
 
     # Advanced implies interactive
@@ -1036,66 +1501,58 @@ def run_pair(
             return ok, slave_flags, master_flags
         return ok
 
-    if pin and (not pin.isdigit() or len(pin) != 4):
-        logger("PIN must be 4 digits.")
-        return _ret(False)
-    if baud <= 0:
-        logger("Baud must be positive.")
-        return _ret(False)
-
+    # All cheap input checks first: nothing is allocated or opened for bad input.
     actual_mode = mode.lower()
-    if actual_mode not in ("one", "two"):
-        logger("Mode must be 'one' or 'two'.")
-        return _ret(False)
-
+    pin_is_valid = not pin or is_valid_pin(pin)
     if actual_mode == "one":
         chosen_port = port or slave_port or master_port
-        if not chosen_port:
-            logger("Mode one requires --port (shared) or at least one port value.")
-            return _ret(False)
-        slave_port = chosen_port
-        master_port = chosen_port
-    else:
-        if not master_port or not slave_port:
-            logger("Mode two requires both --master-port and --slave-port.")
-            return _ret(False)
-        if master_port == slave_port:
-            logger("Master and slave ports must differ in mode two.")
-            return _ret(False)
+        slave_port = master_port = chosen_port
+    problem = None
+    if not pin_is_valid:
+        problem = "PIN must be 4 digits."
+    elif baud <= 0:
+        problem = "Baud must be positive."
+    elif actual_mode not in ("one", "two"):
+        problem = "Mode must be 'one' or 'two'."
+    elif actual_mode == "one" and not slave_port:
+        problem = "Mode one requires --port (shared) or at least one port value."
+    elif actual_mode == "two" and (not master_port or not slave_port):
+        problem = "Mode two requires both --master-port and --slave-port."
+    elif actual_mode == "two" and master_port == slave_port:
+        problem = "Master and slave ports must differ in mode two."
+    if problem:
+        logger(problem)
+        return _ret(False)
 
     context = PairContext()
-    slave_flags = copy.deepcopy(flags)
-    master_flags = copy.deepcopy(flags)
-
-    # ---- SLAVE phase ----
+    slave_flags = flags.clone()
+    master_flags = flags.clone()
     slave_logger = _prefixed_logger(logger, "SLAVE")
-    slave_detect = detect_module(slave_port, logger=slave_logger, stop_event=stop_event)
-    if not slave_detect:
-        slave_logger("!! Detect failed on SLAVE.")
-        return _ret(False)
+    master_logger = _prefixed_logger(logger, "MASTER")
 
-    if actual_mode == "one" and slave_detect.module != "hc05":
-        slave_logger("!! Mode one needs the SLAVE address (recommend SLAVE as HC-05).")
-        return _ret(False)
+    # Mode TWO: the MASTER port is independent, so probe it while SLAVE is configured.
+    # Its output is held back and replayed when the MASTER phase starts, so it does
+    # not interleave with the SLAVE plan or the interactive prompts.
+    probe_stop = threading.Event()
+    probe_lines: List[str] = []
+    master_probe: Optional[asyncio.Task] = None
+    if actual_mode == "two":
+        master_probe = asyncio.create_task(
+            asyncio.to_thread(detect_module, master_port, logger=probe_lines.append, stop_event=probe_stop)
+        )
+        await asyncio.sleep(0)  # let the task hand the probe to its worker thread now
 
     try:
-        slave_plan = build_slave_plan(
-            slave_detect,
-            name=name_slave,
-            pin=pin,
-            baud=baud,
-            flags=slave_flags,
-            require_addr=(actual_mode == "one"),
-        )
-    except PairPlanError as exc:
-        slave_logger(f"!! {exc}")
-        return _ret(False)
+        # ---- SLAVE phase ----
+        slave_detect = detect_module(slave_port, logger=slave_logger, stop_event=stop_event)
+        if not slave_detect:
+            slave_logger("!! Detect failed on SLAVE.")
+            return _ret(False)
 
-    if slave_flags.show_plan:
-        _log_plan("SLAVE", slave_plan, slave_logger)
+        if actual_mode == "one" and slave_detect.module != "hc05":
+            slave_logger("!! Mode one needs the SLAVE address (recommend SLAVE as HC-05).")
+            return _ret(False)
 
-    if slave_flags.interactive:
-        slave_flags = _interactive_tune("SLAVE", slave_plan, slave_flags, logger=logger)
         try:
             slave_plan = build_slave_plan(
                 slave_detect,
@@ -1108,86 +1565,92 @@ def run_pair(
         except PairPlanError as exc:
             slave_logger(f"!! {exc}")
             return _ret(False)
-        if slave_flags.show_plan:
-            _log_plan("SLAVE", slave_plan, slave_logger)
-
-    slave_ok = _run_plan_on_port(
-        slave_port,
-        slave_detect,
-        slave_plan,
-        flags=slave_flags,
-        context=context,
-        logger=slave_logger,
-        choose_addr_cb=choose_addr_cb,
-        stop_event=stop_event,
-        name_value=name_slave,
-        pin_value=pin,
-        baud_value=baud,
-    )
-    if not slave_ok:
-        logger("[FAIL] Could not configure SLAVE.")
-        return _ret(False)
 
-    if context.slave_addr:
-        _write_pair_cache(
-            context.slave_addr[0],
-            context.slave_addr[1],
-            {"port": slave_port, "pin": pin, "baud": baud, "name_slave": name_slave, "mode": actual_mode},
+        slave_basic, slave_extra = _split_plan(slave_plan)
+        if slave_flags.show_plan and not quiet:
+            _log_plan("SLAVE", slave_basic, slave_extra, slave_logger)
+
+        if slave_flags.interactive and slave_basic:
+            slave_flags, changed = await _interactive_tune("SLAVE", slave_basic, slave_flags, logger=logger)
+            if changed:
+                try:
+                    slave_plan = build_slave_plan(
+                        slave_detect,
+                        name=name_slave,
+                        pin=pin,
+                        baud=baud,
+                        flags=slave_flags,
+                        require_addr=(actual_mode == "one"),
+                    )
+                except PairPlanError as exc:
+                    slave_logger(f"!! {exc}")
+                    return _ret(False)
+                if slave_flags.show_plan and not quiet:
+                    _log_plan("SLAVE", *_split_plan(slave_plan), slave_logger)
+
+        slave_ok = _run_plan_on_port(
+            slave_port,
+            slave_detect,
+            slave_plan,
+            flags=slave_flags,
+            context=context,
+            logger=slave_logger,
+            choose_addr_cb=choose_addr_cb,
+            stop_event=stop_event,
+            name_value=name_slave,
+            pin_value=pin,
+            baud_value=baud,
         )
+        if not slave_ok:
+            logger("[FAIL] Could not configure SLAVE.")
+            return _ret(False)
 
-    if actual_mode == "one" and not context.slave_addr and not slave_flags.dry_run:
-        slave_logger("!! Mode one needs the SLAVE address (recommend SLAVE as HC-05).")
-        return _ret(False)
-
-    # ---- Swap prompt (mode ONE) ----
-    if actual_mode == "one" and not flags.dry_run:
-        logger(
-            "Unplug SLAVE from USB-UART.\n"
-            "IMPORTANT: To complete LINK immediately, SLAVE should remain POWERED in DATA mode (KEY/EN LOW).\n"
-            "If SLAVE is not powered, MASTER will still be configured (BIND) and will auto-connect later when both are powered."
-        )
-        if prompt_swap:
-            master_port = prompt_swap(
-                "Swap to MASTER (HC-05). Put MASTER in AT mode (KEY/EN high when powering).",
-                master_port,
-            ) or master_port
-        else:
-            input("Plug MASTER (HC-05) in AT mode, then press Enter to continue... ")
+        if context.slave_addr:
+            _CACHE_EXECUTOR.submit(
+                _write_pair_cache,
+                context.slave_addr[0],
+                context.slave_addr[1],
+                {"port": slave_port, "pin": pin, "baud": baud, "name_slave": name_slave, "mode": actual_mode},
+            )
 
-    # ---- MASTER phase ----
-    master_logger = _prefixed_logger(logger, "MASTER")
-    master_detect = detect_module(master_port, logger=master_logger, stop_event=stop_event)
-    if not master_detect:
-        master_logger("!! Detect failed on MASTER.")
-        return _ret(False)
-    if master_detect.module != "hc05":
-        master_logger("!! MASTER must be HC-05 (ROLE/PAIR/BIND/LINK).")
-        return _ret(False)
+        if actual_mode == "one" and not context.slave_addr and not slave_flags.dry_run:
+            slave_logger("!! Mode one needs the SLAVE address (recommend SLAVE as HC-05).")
+            return _ret(False)
 
-    # Mode TWO: we want LINK (device should be present, on another port)
-    # Mode ONE: do NOT require LINK (SLAVE might be unpowered after swap)
-    require_link = (actual_mode == "two") and (not master_flags.no_link)
+        # ---- Swap prompt (mode ONE) ----
+        if actual_mode == "one" and not flags.dry_run:
+            logger(
+                "Unplug SLAVE from USB-UART.\n"
+                "IMPORTANT: To complete LINK immediately, SLAVE should remain POWERED in DATA mode (KEY/EN LOW).\n"
+                "If SLAVE is not powered, MASTER will still be configured (BIND) and will auto-connect later when both are powered."
+            )
+            if prompt_swap:
+                master_port = await _run_detached(
+                    prompt_swap,
+                    "Swap to MASTER (HC-05). Put MASTER in AT mode (KEY/EN high when powering).",
+                    master_port,
+                ) or master_port
+            else:
+                await _run_detached(input, "Plug MASTER (HC-05) in AT mode, then press Enter to continue... ")
 
-    try:
-        master_plan = build_master_plan(
-            master_detect,
-            name=name_master,
-            pin=pin,
-            baud=baud,
-            flags=master_flags,
-            slave_addr=context.slave_addr,
-            want_scan=(context.slave_addr is None),
-            require_link=require_link,
-        )
-    except PairPlanError as exc:
-        master_logger(f"!! {exc}")
-        return _ret(False)
+        # ---- MASTER phase ----
+        if master_probe is not None:
+            master_detect = await _await_probe(master_probe, stop_event, probe_stop)
+            for line in probe_lines:
+                master_logger(line)
+        else:
+            master_detect = detect_module(master_port, logger=master_logger, stop_event=stop_event)
+        if not master_detect:
+            master_logger("!! Detect failed on MASTER.")
+            return _ret(False)
+        if master_detect.module != "hc05":
+            master_logger("!! MASTER must be HC-05 (ROLE/PAIR/BIND/LINK).")
+            return _ret(False)
 
-    if master_flags.show_plan:
-        _log_plan("MASTER", master_plan, master_logger)
+        # Mode TWO: we want LINK (device should be present, on another port)
+        # Mode ONE: do NOT require LINK (SLAVE might be unpowered after swap)
+        require_link = (actual_mode == "two") and (not master_flags.no_link)
 
-    if master_flags.interactive:
-        master_flags = _interactive_tune("MASTER", master_plan, master_flags, logger=logger)
         try:
             master_plan = build_master_plan(
                 master_detect,
@@ -1202,40 +1665,105 @@ def run_pair(
         except PairPlanError as exc:
             master_logger(f"!! {exc}")
             return _ret(False)
-        if master_flags.show_plan:
-            _log_plan("MASTER", master_plan, master_logger)
-
-    master_ok = _run_plan_on_port(
-        master_port,
-        master_detect,
-        master_plan,
-        flags=master_flags,
-        context=context,
-        logger=master_logger,
-        choose_addr_cb=choose_addr_cb,
-        stop_event=stop_event,
-        name_value=name_master,
-        pin_value=pin,
-        baud_value=baud,
-    )
-    if not master_ok:
-        logger("[FAIL] MASTER phase failed.")
-        return _ret(False)
 
-    # Final outcome messaging:
-    if require_link:
+        master_basic, master_extra = _split_plan(master_plan)
+        if master_flags.show_plan and not quiet:
+            _log_plan("MASTER", master_basic, master_extra, master_logger)
+
+        if master_flags.interactive and master_basic:
+            master_flags, changed = await _interactive_tune("MASTER", master_basic, master_flags, logger=logger)
+            if changed:
+                try:
+                    master_plan = build_master_plan(
+                        master_detect,
+                        name=name_master,
+                        pin=pin,
+                        baud=baud,
+                        flags=master_flags,
+                        slave_addr=context.slave_addr,
+                        want_scan=(context.slave_addr is None),
+                        require_link=require_link,
+                    )
+                except PairPlanError as exc:
+                    master_logger(f"!! {exc}")
+                    return _ret(False)
+                if master_flags.show_plan and not quiet:
+                    _log_plan("MASTER", *_split_plan(master_plan), master_logger)
+
+        master_ok = _run_plan_on_port(
+            master_port,
+            master_detect,
+            master_plan,
+            flags=master_flags,
+            context=context,
+            logger=master_logger,
+            choose_addr_cb=choose_addr_cb,
+            stop_event=stop_event,
+            name_value=name_master,
+            pin_value=pin,
+            baud_value=baud,
+        )
+        if not master_ok:
+            logger("[FAIL] MASTER phase failed.")
+            return _ret(False)
+
+        # Final outcome messaging:
+        if require_link:
+            if context.master_link_ok:
+                logger("[PASS] MASTER/SLAVE paired (LINK OK).")
+                return _ret(True)
+            logger("[FAIL] LINK required but did not succeed.")
+            return _ret(False)
+
+        # Mode ONE: treat as PASS if MASTER config succeeded (BIND critical)
         if context.master_link_ok:
             logger("[PASS] MASTER/SLAVE paired (LINK OK).")
-            return _ret(True)
-        logger("[FAIL] LINK required but did not succeed.")
-        return _ret(False)
+        else:
+            logger(
+                "[PASS] MASTER configured (BIND set). LINK may fail in one-port swap if SLAVE is unpowered.\n"
+                "NEXT: Power both modules in DATA mode (KEY/EN LOW). MASTER should auto-connect to the bound SLAVE."
+            )
+        return _ret(True)
+    finally:
+        # Abort a probe that is still running when the SLAVE phase bails out.
+        probe_stop.set()
 
-    # Mode ONE: treat as PASS if MASTER config succeeded (BIND critical)
-    if context.master_link_ok:
-        logger("[PASS] MASTER/SLAVE paired (LINK OK).")
-    else:
-        logger(
-            "[PASS] MASTER configured (BIND set). LINK may fail in one-port swap if SLAVE is unpowered.\n"
-            "NEXT: Power both modules in DATA mode (KEY/EN LOW). MASTER should auto-connect to the bound SLAVE."
+
+def run_pair(
+    *,
+    mode: str,
+    master_port: Optional[str],
+    slave_port: Optional[str],
+    port: Optional[str],
+    name_master: Optional[str],
+    name_slave: Optional[str],
+    pin: Optional[str],
+    baud: int,
+    flags: Optional[PairFlags] = None,
+    prompt_swap: Optional[Callable[[str, str], str]] = None,
+    choose_addr_cb: Optional[Callable[[List[Tuple[str, str]]], Optional[Tuple[str, str]]]] = None,
+    logger: Optional[Logger] = print,
+    stop_event=None,
+    return_flags: bool = False,
+):
+    """Synchronous entry point for CLI/GUI callers; see run_pair_async (logger=None runs silently)."""
+    import asyncio
+
+    return asyncio.run(
+        run_pair_async(
+            mode=mode,
+            master_port=master_port,
+            slave_port=slave_port,
+            port=port,
+            name_master=name_master,
+            name_slave=name_slave,
+            pin=pin,
+            baud=baud,
+            flags=flags,
+            prompt_swap=prompt_swap,
+            choose_addr_cb=choose_addr_cb,
+            logger=logger,
+            stop_event=stop_event,
+            return_flags=return_flags,
         )
-    return _ret(True)
+    )
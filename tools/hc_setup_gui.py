@@ -6,17 +6,27 @@ Tkinter GUI for HC-05 / HC-06 setup, reusing hc_core logic.
 
 Fixes added:
 - Pair/Setup tabs are scrollable (Canvas + Scrollbar)
-- Mouse wheel scroll works even when cursor is over ttk widgets (combobox/entry/checkbutton)
+- Mouse wheel scroll works even when cursor is over ttk widgets (combobox/entry/checkbutton):
+  every widget of a scroll region carries that region's bind tag
 - Plan Preview + Log have both vertical/horizontal scrollbars and wheel support
 - Thread-safe dialogs (no Tk calls in worker thread)
+
+Threading: worker -> UI data (log lines) always goes through log_queue; the first
+line of a burst posts one drain to the Tk thread, and the worker never waits on the UI. _ui_sync is reserved for
+dialogs/calls that need a result on the Tk thread, and gives up with TimeoutError
+if the Tk thread does not pick the call up within _UI_SYNC_TIMEOUT seconds.
 """
 
 from __future__ import annotations
 
+import functools
 import os
 import queue
+import sys
 import threading
+import time
 import tkinter as tk
+from dataclasses import dataclass
 from tkinter import messagebox, simpledialog, ttk
 from typing import Callable, Dict, List, Optional, Tuple
 
@@ -28,10 +38,13 @@ import serial  # pyserial
 from serial import SerialException
 
 from hc_core import (  # noqa: E402
+    DetectionResult,
     HC06_BAUD_MAP,
     PairFlags,
     detect_module,
+    detect_modules,
     format_port_entry,
+    is_valid_pin,
     list_serial_ports,
     parse_addr_response,
     run_pair,
@@ -49,6 +62,38 @@ BAUD_CHOICES = [
     "921600",
 ]
 
+# Plan preview: HC-06 AT+BAUD code keyed by the baud string shown in the combo,
+# and placeholders for inputs that are still empty.
+_HC06_CODE_BY_STR = {str(baud): str(code) for baud, code in HC06_BAUD_MAP.items()}
+_MISSING_NAME = "<MISSING NAME> !!"
+_MISSING_PIN = "<MISSING PIN> !!"
+_MISSING_BAUD = "<MISSING BAUD> !!"
+
+# Max seconds a worker waits for the Tk thread to pick up a _ui_sync call.
+_UI_SYNC_TIMEOUT = 30.0
+
+# A detect result this recent (seconds, same port) lets single setup skip its own detect.
+_DETECT_CACHE_TTL = 30.0
+
+
+def _validate_pin(pin: Optional[str]) -> Optional[str]:
+    """Return an error message for a bad PIN, or None if it is blank or valid."""
+    if pin and not is_valid_pin(pin):
+        return "PIN must be exactly 4 digits or blank."
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class _SetupCmd:
+    # One single-setup AT command; fail_msg=None means the result is not checked.
+    command: str
+    fail_msg: Optional[str] = None
+    expect_ok: bool = True
+    retries: int = 1
+    fallback: Optional[str] = None
+    fallback_note: str = ""
+    on_response: Optional[Callable[[str], None]] = None
+
 
 class SetupApp:
     def __init__(self, root: tk.Tk) -> None:
@@ -63,11 +108,24 @@ class SetupApp:
         menubar.add_cascade(label="Help", menu=help_menu)
         self.root.config(menu=menubar)
 
-        self.log_queue: queue.Queue[str] = queue.Queue()
-        self.worker: Optional[threading.Thread] = None
+        self.log_queue: queue.SimpleQueue[str] = queue.SimpleQueue()  # no join/task_done needed
+        self._log_max_lines = 5000  # older lines are dropped from the log view
+        self._log_trim_slack = 500  # trim in chunks once this many lines over the cap
+        self._log_lines = 0  # lines currently in log_text
+        self._log_drain_pending = False  # a _drain_log_queue call is already posted
+        # One long-lived worker runs every task; _busy is only touched on the Tk thread.
+        self._jobs: queue.SimpleQueue[Tuple[str, dict]] = queue.SimpleQueue()
+        self._busy = False
+        self._controls_running = False  # buttons are built in the idle state
+        self._adv_state_key: Optional[Tuple[bool, bool, str]] = None  # last synced (advanced, basic, mode)
+        # port -> (time.monotonic() of detect, result); only touched on the worker thread.
+        self._detect_cache: Dict[str, Tuple[float, DetectionResult]] = {}
         self.stop_event: Optional[threading.Event] = None
-        self.port_map: Dict[str, str] = {}
+        self.port_map: Dict[str, str] = {}  # combobox display -> device, in combobox order
         self.last_detected_module: Optional[str] = None
+        self._last_plan_lines: List[str] = []  # what plan_list currently shows
+        self._inputs_after_id: Optional[str] = None  # pending debounced input refresh
+        self._inputs_dirty = False  # an idle refresh of role state + plan is queued
 
         # scroll targets (set later)
         self._setup_canvas: Optional[tk.Canvas] = None
@@ -76,31 +134,88 @@ class SetupApp:
         self._pair_body: Optional[ttk.Frame] = None
         self._paned: Optional[ttk.Panedwindow] = None
         self._pane_split_set = False
+        self._region_index_pending = False
+        self._palette: Dict[str, str] = {}  # filled by _build_ui
+        self._extra_cache: Dict[str, List[str]] = {}  # extra-commands Text path -> last parsed lines
+
+        # Worker -> UI calls: a self-pipe wakes Tk immediately where file handlers exist.
+        self._ui_calls: queue.Queue[Callable[[], None]] = queue.Queue()
+        self._ui_pipe_w: Optional[int] = self._open_ui_pipe()
+        self.worker = threading.Thread(target=self._worker_loop, name="hc-worker", daemon=True)
+        self.worker.start()
 
+        # Build while withdrawn and show once: a single layout pass instead of one
+        # visible re-layout per pack/grid call.
+        self.root.withdraw()
         self._build_ui()
-        self._bind_global_mousewheel()
+        self._run_buttons = (self.detect_btn, self.run_btn, self.pair_detect_btn, self.pair_run_btn)
+        self._stop_buttons = (self.stop_btn, self.pair_stop_btn)
+        self._index_scroll_regions()
+        self._bind_mousewheel()
         # Defer split until layout is realized to avoid bottom pane taking all space on small windows.
         self.root.after_idle(self._set_default_pane_split)
 
-        self.refresh_ports()
         self._update_mode_state()
         self._update_single_plan_preview()
-        self._poll_log_queue()
 
         # Default: open Pair tab
         self.notebook.select(self.pair_tab)
+        self.root.update_idletasks()
+        self.root.deiconify()
+
+        # After deiconify: a "no serial ports" notice should sit over a visible window.
+        self.refresh_ports()
+        self._drain_log_queue()
 
     # -------------------------
     # Thread-safe UI helpers
     # -------------------------
+    def _open_ui_pipe(self) -> Optional[int]:
+        try:
+            r, w = os.pipe()
+        except OSError:
+            return None
+        try:
+            self.root.tk.createfilehandler(r, tk.READABLE, self._on_ui_pipe)
+        except (AttributeError, RuntimeError, tk.TclError):
+            # Windows Tk has no createfilehandler: _ui_sync falls back to after(0).
+            os.close(r)
+            os.close(w)
+            return None
+        return w
+
+    def _on_ui_pipe(self, fd: int, _mask: int) -> None:
+        os.read(fd, 512)
+        try:
+            while True:
+                self._ui_calls.get_nowait()()
+        except queue.Empty:
+            pass
+
+    def _post_ui(self, fn: Callable[[], None]) -> None:
+        # Run fn on the Tk thread soon; safe to call from any thread.
+        if self._ui_pipe_w is not None:
+            self._ui_calls.put(fn)
+            os.write(self._ui_pipe_w, b"\0")
+        else:
+            self.root.after(0, fn)
+
     def _ui_sync(self, fn: Callable[[], object]) -> object:
         if threading.current_thread() is threading.main_thread():
             return fn()
 
+        started = threading.Event()
         done = threading.Event()
-        out: Dict[str, object] = {"val": None, "err": None}
+        # "state" goes from "pending" to exactly one of "started" / "abandoned", under lock.
+        lock = threading.Lock()
+        out: Dict[str, object] = {"val": None, "err": None, "state": "pending"}
 
         def _run():
+            with lock:
+                if out["state"] != "pending":
+                    return
+                out["state"] = "started"
+            started.set()
             try:
                 out["val"] = fn()
             except Exception as e:
@@ -108,23 +223,30 @@ class SetupApp:
             finally:
                 done.set()
 
-        self.root.after(0, _run)
+        self._post_ui(_run)
+        # Time-box only the hand-off: once a dialog is up, the user may take as long as needed.
+        if not started.wait(timeout=_UI_SYNC_TIMEOUT):
+            with lock:
+                if out["state"] == "pending":
+                    out["state"] = "abandoned"
+            if out["state"] == "abandoned":
+                raise TimeoutError(f"UI thread did not respond within {_UI_SYNC_TIMEOUT:.0f}s")
         done.wait()
         if out["err"] is not None:
             raise out["err"]  # type: ignore[misc]
         return out["val"]
 
     def _show_info(self, title: str, msg: str) -> None:
-        self._ui_sync(lambda: messagebox.showinfo(title, msg, parent=self.root))
+        self._ui_sync(functools.partial(messagebox.showinfo, title, msg, parent=self.root))
 
     def _show_warn(self, title: str, msg: str) -> None:
-        self._ui_sync(lambda: messagebox.showwarning(title, msg, parent=self.root))
+        self._ui_sync(functools.partial(messagebox.showwarning, title, msg, parent=self.root))
 
     def _show_error(self, title: str, msg: str) -> None:
-        self._ui_sync(lambda: messagebox.showerror(title, msg, parent=self.root))
+        self._ui_sync(functools.partial(messagebox.showerror, title, msg, parent=self.root))
 
     def _ask_string(self, title: str, prompt: str) -> Optional[str]:
-        return self._ui_sync(lambda: simpledialog.askstring(title, prompt, parent=self.root))  # type: ignore[return-value]
+        return self._ui_sync(functools.partial(simpledialog.askstring, title, prompt, parent=self.root))  # type: ignore[return-value]
 
     # -------------------------
     # Scrollable tab helper
@@ -137,7 +259,7 @@ class SetupApp:
         outer = ttk.Frame(parent, style="Content.TFrame")
         outer.pack(fill="both", expand=True)
 
-        panel_bg = (getattr(self, "_palette", {}) or {}).get("PANEL", "#ffffff")
+        panel_bg = self._palette.get("PANEL", "#ffffff")
         canvas = tk.Canvas(outer, highlightthickness=0, background=panel_bg, borderwidth=0)
         vsb = ttk.Scrollbar(outer, orient="vertical", command=canvas.yview)
         canvas.configure(yscrollcommand=vsb.set)
@@ -162,59 +284,57 @@ class SetupApp:
 
         return canvas, inner
 
-    def _is_descendant(self, w: Optional[tk.Misc], ancestor: Optional[tk.Misc]) -> bool:
-        if w is None or ancestor is None:
-            return False
-        cur = w
-        while cur is not None:
-            if cur == ancestor:
-                return True
-            cur = getattr(cur, "master", None)
-        return False
-
-    def _wheel_units(self, event) -> int:
-        # Windows/macOS use delta, Linux uses Button-4/5
-        if getattr(event, "delta", 0):
-            return int(-1 * (event.delta / 120))
-        if getattr(event, "num", None) == 4:
-            return -3
-        if getattr(event, "num", None) == 5:
-            return 3
-        return 0
-
-    def _bind_global_mousewheel(self) -> None:
-        # Bind once for whole app, then decide where to scroll based on cursor position.
-        self.root.bind_all("<MouseWheel>", self._on_global_mousewheel, add="+")
-        self.root.bind_all("<Button-4>", self._on_global_mousewheel, add="+")
-        self.root.bind_all("<Button-5>", self._on_global_mousewheel, add="+")
-
-    def _on_global_mousewheel(self, event):
-        units = self._wheel_units(event)
-        if units == 0:
-            return
-
-        # what widget is under cursor?
-        w = self.root.winfo_containing(event.x_root, event.y_root)
-
-        # Priority 1: plan/log text (so text scroll feels natural)
-        if hasattr(self, "plan_text") and self._is_descendant(w, self.plan_text):
-            self.plan_text.yview_scroll(units, "units")
-            return "break"
-
-        if hasattr(self, "log_text") and self._is_descendant(w, self.log_text):
-            self.log_text.yview_scroll(units, "units")
-            return "break"
-
-        # Priority 2: scrollable tabs
-        if self._pair_body is not None and self._pair_canvas is not None and self._is_descendant(w, self._pair_body):
-            self._pair_canvas.yview_scroll(units, "units")
-            return "break"
-
-        if self._setup_body is not None and self._setup_canvas is not None and self._is_descendant(w, self._setup_body):
-            self._setup_canvas.yview_scroll(units, "units")
-            return "break"
+    def _scroll_regions(self) -> Tuple[Tuple[str, Tuple[Optional[tk.Misc], ...], Optional[tk.Misc]], ...]:
+        # (bind tag, widgets whose subtree belongs to the region, widget to scroll).
+        # Tabs first, then plan/log text, so text scroll wins over the tab holding it.
+        return (
+            ("HcWheelSetup", (self._setup_canvas, self._setup_body), self._setup_canvas),
+            ("HcWheelPair", (self._pair_canvas, self._pair_body), self._pair_canvas),
+            ("HcWheelPlan", (self.plan_list,), self.plan_list),
+            ("HcWheelLog", (self.log_text,), self.log_text),
+        )
 
-        return
+    def _index_scroll_regions(self) -> None:
+        """Put each widget's region tag first in its bindtags, so Tk routes the wheel itself."""
+        self._region_index_pending = False
+        tag_for: Dict[str, Tuple[tk.Misc, str]] = {}
+        for tag, tops, _target in self._scroll_regions():
+            pending: List[tk.Misc] = [w for w in tops if w is not None]
+            while pending:
+                w = pending.pop()
+                tag_for[str(w)] = (w, tag)
+                pending.extend(w.winfo_children())
+        for w, tag in tag_for.values():
+            tags = w.bindtags()
+            if tags[0] != tag:
+                w.bindtags((tag,) + tuple(t for t in tags if not t.startswith("HcWheel")))
+
+    def _schedule_region_index(self, _event=None) -> None:
+        # Re-tag once per idle cycle after a scroll body changes layout.
+        if not self._region_index_pending:
+            self._region_index_pending = True
+            self.root.after_idle(self._index_scroll_regions)
+
+    def _bind_mousewheel(self) -> None:
+        # One class binding per scroll region; _index_scroll_regions tags the widgets.
+        # The bindings are plain Tcl scripts: each tag has a fixed target, so a wheel tick
+        # never enters Python, and Tk already defers the redraw to idle. "break" stops class
+        # bindings (Text scroll, Combobox value cycling) from also firing.
+        ws = self.root.tk.call("tk", "windowingsystem")
+        if ws == "x11" and tk.TkVersion < 8.7:
+            # X11 on Tk 8.6: wheel arrives as Button-4/5
+            units_by_sequence = (("<Button-4>", "-3"), ("<Button-5>", "3"))
+        else:
+            # Windows/macOS (and X11 on Tk 8.7+): <MouseWheel> with delta
+            units_by_sequence = (("<MouseWheel>", "[expr {int(-(%D) / 120.0)}]"),)
+        for tag, _tops, target in self._scroll_regions():
+            if target is None:
+                continue
+            for sequence, units in units_by_sequence:
+                self.root.bind_class(tag, sequence, f"{target} yview scroll {units} units; break")
+        for body in (self._setup_body, self._pair_body):
+            if body is not None:
+                body.bind("<Configure>", self._schedule_region_index, add="+")
 
     # -------------------------
     # UI build
@@ -409,21 +529,23 @@ class SetupApp:
         plan_inner = ttk.Frame(plan_box)
         plan_inner.pack(fill="both", expand=True)
 
-        self.plan_text = tk.Text(
+        # Display-only lines: a Listbox avoids the Text tagging/layout engine.
+        self.plan_list = tk.Listbox(
             plan_inner,
             height=9,
-            wrap="none",
-            state="disabled",
+            activestyle="none",
+            exportselection=False,
+            font="TkFixedFont",
             bg="#ffffff",
             fg="#000000",
-            insertbackground="#2563eb",
+            highlightthickness=0,
             relief="flat",
         )
-        plan_vsb = ttk.Scrollbar(plan_inner, orient="vertical", command=self.plan_text.yview)
-        plan_hsb = ttk.Scrollbar(plan_inner, orient="horizontal", command=self.plan_text.xview)
-        self.plan_text.configure(yscrollcommand=plan_vsb.set, xscrollcommand=plan_hsb.set)
+        plan_vsb = ttk.Scrollbar(plan_inner, orient="vertical", command=self.plan_list.yview)
+        plan_hsb = ttk.Scrollbar(plan_inner, orient="horizontal", command=self.plan_list.xview)
+        self.plan_list.configure(yscrollcommand=plan_vsb.set, xscrollcommand=plan_hsb.set)
 
-        self.plan_text.grid(row=0, column=0, sticky="nsew")
+        self.plan_list.grid(row=0, column=0, sticky="nsew")
         plan_vsb.grid(row=0, column=1, sticky="ns")
         plan_hsb.grid(row=1, column=0, sticky="ew")
         plan_inner.rowconfigure(0, weight=1)
@@ -442,7 +564,7 @@ class SetupApp:
         self.stop_btn.pack(side="left")
 
         for var in (self.name_var, self.pin_var, self.baud_var, self.role_var, self.module_var):
-            var.trace_add("write", lambda *_: self._on_single_inputs_changed())
+            var.trace_add("write", self._on_single_var_written)
 
         # =========================
         # Pair tab (build into pair_body)
@@ -453,7 +575,7 @@ class SetupApp:
         self.mode_var = tk.StringVar(value="two")
         self.mode_combo = ttk.Combobox(mode_row, textvariable=self.mode_var, state="readonly", values=["two", "one"], width=10)
         self.mode_combo.pack(side="left", padx=4)
-        self.mode_combo.bind("<<ComboboxSelected>>", lambda _: self._update_mode_state())
+        self.mode_combo.bind("<<ComboboxSelected>>", self._update_mode_state)
         ttk.Button(mode_row, text="Refresh Ports", command=self.refresh_ports).pack(side="left", padx=6)
 
         prow1 = ttk.Frame(pair_body)
@@ -518,8 +640,6 @@ class SetupApp:
         ttk.Label(steps_frame, text="SLAVE basic steps:").grid(row=0, column=0, sticky="w")
         ttk.Label(steps_frame, text="MASTER basic steps:").grid(row=0, column=1, sticky="w", padx=(12, 0))
 
-        self.slave_step_vars: Dict[str, tk.BooleanVar] = {}
-        self.slave_step_widgets: Dict[str, ttk.Checkbutton] = {}
         self.slave_critical = {"at", "role0", "uart"}
 
         slave_steps = [
@@ -531,15 +651,11 @@ class SetupApp:
             ("uart", "UART/BAUD (critical)"),
             ("addr", "AT+ADDR? (mode=one required)"),
         ]
-        for idx, (sid, label) in enumerate(slave_steps, start=1):
-            var = tk.BooleanVar(value=True)
-            chk = ttk.Checkbutton(steps_frame, text=label, variable=var)
-            chk.grid(row=idx, column=0, sticky="w", pady=1)
-            self.slave_step_vars[sid] = var
-            self.slave_step_widgets[sid] = chk
+        self.slave_step_vars: Dict[str, tk.BooleanVar] = {sid: tk.BooleanVar(value=True) for sid, _ in slave_steps}
+        self.slave_step_widgets: Dict[str, ttk.Checkbutton] = {
+            sid: ttk.Checkbutton(steps_frame, text=label, variable=self.slave_step_vars[sid]) for sid, label in slave_steps
+        }
 
-        self.master_step_vars: Dict[str, tk.BooleanVar] = {}
-        self.master_step_widgets: Dict[str, ttk.Checkbutton] = {}
         self.master_critical = {"at", "role1", "cmode", "uart", "bind", "link"}
 
         master_steps = [
@@ -556,12 +672,20 @@ class SetupApp:
             ("link", "AT+LINK (optional in mode one)"),
             ("reset", "AT+RESET"),
         ]
-        for idx, (sid, label) in enumerate(master_steps, start=1):
-            var = tk.BooleanVar(value=True)
-            chk = ttk.Checkbutton(steps_frame, text=label, variable=var)
+        self.master_step_vars: Dict[str, tk.BooleanVar] = {sid: tk.BooleanVar(value=True) for sid, _ in master_steps}
+        self.master_step_widgets: Dict[str, ttk.Checkbutton] = {
+            sid: ttk.Checkbutton(steps_frame, text=label, variable=self.master_step_vars[sid]) for sid, label in master_steps
+        }
+        # Only these step ids can ever end up in skip_steps; mode ONE also needs the SLAVE address.
+        self._noncrit_slave = frozenset(self.slave_step_vars) - self.slave_critical
+        self._noncrit_slave_one = self._noncrit_slave - {"addr"}
+        self._noncrit_master = frozenset(self.master_step_vars) - self.master_critical
+
+        # Place both columns only after every checkbutton exists (one layout for the whole grid).
+        for idx, chk in enumerate(self.slave_step_widgets.values(), start=1):
+            chk.grid(row=idx, column=0, sticky="w", pady=1)
+        for idx, chk in enumerate(self.master_step_widgets.values(), start=1):
             chk.grid(row=idx, column=1, sticky="w", padx=(12, 0), pady=1)
-            self.master_step_vars[sid] = var
-            self.master_step_widgets[sid] = chk
 
         extra_frame = ttk.Frame(adv_frame)
         extra_frame.pack(fill="x", pady=4)
@@ -673,18 +797,16 @@ class SetupApp:
     # Ports
     # -------------------------
     def refresh_ports(self) -> None:
-        ports = list_serial_ports()
-        display_list: List[str] = []
-        self.port_map.clear()
-
-        for p in ports:
-            display = format_port_entry(p)
-            self.port_map[display] = p.device
-            display_list.append(display)
-
-        self.port_combo["values"] = display_list
-        self.master_port_combo["values"] = display_list
-        self.slave_port_combo["values"] = display_list
+        # Interned keys: the display strings are looked up again on every action.
+        new_map = {sys.intern(format_port_entry(p)): p.device for p in list_serial_ports()}
+        display_list = tuple(new_map)
+        # Same ports as last time: keep the old map and leave the comboboxes alone.
+        changed = new_map != self.port_map or list(new_map) != list(self.port_map)
+        if changed:
+            self.port_map = new_map
+            self.port_combo["values"] = display_list
+            self.master_port_combo["values"] = display_list
+            self.slave_port_combo["values"] = display_list
 
         if display_list:
             if not self.port_var.get().strip():
@@ -707,8 +829,9 @@ class SetupApp:
                 "- Check permissions / COM port access\n",
             )
 
-        self._update_mode_state()
-        self._update_single_plan_preview()
+        if changed:
+            self._update_mode_state()
+            self._update_single_plan_preview()
 
     # -------------------------
     # Presets
@@ -733,7 +856,25 @@ class SetupApp:
         self.step_read_addr.set(False)
         self._on_single_inputs_changed()
 
+    def _on_single_var_written(self, *_args) -> None:
+        # Debounce keystrokes: a burst of writes triggers one refresh 100 ms after the last.
+        if self._inputs_after_id is not None:
+            self.root.after_cancel(self._inputs_after_id)
+        self._inputs_after_id = self.root.after(100, self._on_inputs_debounced)
+
+    def _on_inputs_debounced(self) -> None:
+        self._inputs_after_id = None
+        self._on_single_inputs_changed()
+
     def _on_single_inputs_changed(self) -> None:
+        # Presets and toggles change several inputs at once: refresh once when idle.
+        if self._inputs_dirty:
+            return
+        self._inputs_dirty = True
+        self.root.after_idle(self._flush_inputs_changed)
+
+    def _flush_inputs_changed(self) -> None:
+        self._inputs_dirty = False
         self._update_role_state()
         self._update_single_plan_preview()
 
@@ -747,68 +888,49 @@ class SetupApp:
         return self.last_detected_module
 
     def _build_single_plan_lines(self, module: str) -> List[str]:
-        name = self.name_var.get().strip()
-        pin = self.pin_var.get().strip()
+        name = self.name_var.get().strip() or _MISSING_NAME
+        pin = self.pin_var.get().strip() or _MISSING_PIN
         baud = self.baud_var.get().strip()
         role = self.role_var.get().strip().lower()
 
         want_name = self.step_set_name.get()
         want_pin = self.step_set_pin.get()
         want_uart = self.step_set_uart.get()
-        want_role = self.step_set_role.get()
         want_addr = self.step_read_addr.get()
         want_reset = self.step_reset.get()
 
-        lines: List[str] = []
-        lines.append(f"MODULE: {module.upper()}")
-        lines.append("1) AT  (critical)")
-        idx = 2
-
+        # Commands only; numbering is added in one pass at the end.
+        steps: List[str] = ["AT  (critical)"]
         if module == "hc05":
             if want_name:
-                lines.append(f"{idx}) AT+NAME={name if name else '<MISSING NAME> !!'}")
-                idx += 1
+                steps.append("AT+NAME=" + name)
             if want_pin:
-                lines.append(f"{idx}) AT+PSWD={pin if pin else '<MISSING PIN> !!'} (fallback AT+PIN=xxxx)")
-                idx += 1
+                steps.append("AT+PSWD=" + pin + " (fallback AT+PIN=xxxx)")
             if want_uart:
-                lines.append(f"{idx}) AT+UART={baud if baud else '<MISSING BAUD> !!'},0,0")
-                idx += 1
-            if want_role:
-                rv = "0" if role != "master" else "1"
-                lines.append(f"{idx}) AT+ROLE={rv} ({role})")
-                idx += 1
+                steps.append("AT+UART=" + (baud or _MISSING_BAUD) + ",0,0")
+            if self.step_set_role.get():
+                steps.append(("AT+ROLE=1 (" if role == "master" else "AT+ROLE=0 (") + role + ")")
             if want_addr:
-                lines.append(f"{idx}) AT+ADDR? (read address)")
-                idx += 1
+                steps.append("AT+ADDR? (read address)")
             if want_reset:
-                lines.append(f"{idx}) AT+RESET (optional)")
-                idx += 1
+                steps.append("AT+RESET (optional)")
         else:
             if want_name:
-                lines.append(f"{idx}) AT+NAME{name if name else '<MISSING NAME> !!'} (fallback AT+NAME=<name>)")
-                idx += 1
+                steps.append("AT+NAME" + name + " (fallback AT+NAME=<name>)")
             if want_pin:
-                lines.append(f"{idx}) AT+PIN{pin if pin else '<MISSING PIN> !!'} (fallback AT+PSWD=xxxx)")
-                idx += 1
+                steps.append("AT+PIN" + pin + " (fallback AT+PSWD=xxxx)")
             if want_uart:
                 if baud:
-                    try:
-                        b = int(baud)
-                        code = HC06_BAUD_MAP.get(b)
-                    except Exception:
-                        code = None
-                    lines.append(f"{idx}) AT+BAUD{code if code else '?'} (baud={baud})")
+                    steps.append("AT+BAUD" + _HC06_CODE_BY_STR.get(baud, "?") + " (baud=" + baud + ")")
                 else:
-                    lines.append(f"{idx}) AT+BAUD<MISSING BAUD> !!")
-                idx += 1
+                    steps.append("AT+BAUD" + _MISSING_BAUD)
             if want_addr:
-                lines.append(f"{idx}) AT+ADDR? (often unsupported on HC-06)")
-                idx += 1
+                steps.append("AT+ADDR? (often unsupported on HC-06)")
             if want_reset:
-                lines.append(f"{idx}) (skip) RESET not standard on HC-06")
-                idx += 1
+                steps.append("(skip) RESET not standard on HC-06")
 
+        lines = ["MODULE: " + module.upper()]
+        lines.extend(f"{idx}) {step}" for idx, step in enumerate(steps, start=1))
         return lines
 
     def _update_single_plan_preview(self) -> None:
@@ -828,10 +950,19 @@ class SetupApp:
             text_lines.append("")
             text_lines.extend(self._build_single_plan_lines(module))
 
-        self.plan_text.configure(state="normal")
-        self.plan_text.delete("1.0", "end")
-        self.plan_text.insert("end", "\n".join(text_lines) + "\n")
-        self.plan_text.configure(state="disabled")
+        old_lines = self._last_plan_lines
+        if text_lines == old_lines:
+            return
+        # Touch only the rows that changed, then trim or extend the tail.
+        for idx, (new, old) in enumerate(zip(text_lines, old_lines)):
+            if new != old:
+                self.plan_list.delete(idx)
+                self.plan_list.insert(idx, new)
+        if len(text_lines) < len(old_lines):
+            self.plan_list.delete(len(text_lines), "end")
+        elif len(text_lines) > len(old_lines):
+            self.plan_list.insert("end", *text_lines[len(old_lines):])
+        self._last_plan_lines = text_lines
 
     # -------------------------
     # Buttons
@@ -869,6 +1000,11 @@ class SetupApp:
     # -------------------------
     # Collect params
     # -------------------------
+    @staticmethod
+    def _opt(var: tk.Variable) -> Optional[str]:
+        # Stripped entry text, or None when blank.
+        return var.get().strip() or None
+
     def _collect_single_params(self, *, validate_only_port: bool) -> Optional[dict]:
         display_port = self.port_var.get().strip()
         if not display_port:
@@ -889,8 +1025,8 @@ class SetupApp:
             "reset": bool(self.step_reset.get()),
         }
 
-        name = self.name_var.get().strip() or None
-        pin = self.pin_var.get().strip() or None
+        name = self._opt(self.name_var)
+        pin = self._opt(self.pin_var)
         role = self.role_var.get().strip().lower()
         baud_str = self.baud_var.get().strip()
 
@@ -898,27 +1034,22 @@ class SetupApp:
             return {"port": port, "module": module, "name": name, "pin": pin, "baud": baud_str, "role": role, "steps": steps}
 
         if steps["set_name"] and not name:
-            ans = self._ask_string("Missing NAME", "You enabled 'Set NAME' but Name is empty.\nEnter NAME:")
-            if not ans:
-                return None
-            ans = ans.strip()
+            ans = (self._ask_string("Missing NAME", "You enabled 'Set NAME' but Name is empty.\nEnter NAME:") or "").strip()
             if not ans:
                 return None
             self.name_var.set(ans)
             name = ans
 
         if steps["set_pin"] and not pin:
-            ans = self._ask_string("Missing PIN", "You enabled 'Set PIN/PSWD' but PIN is empty.\nEnter 4-digit PIN:")
-            if not ans:
-                return None
-            ans = ans.strip()
+            ans = (self._ask_string("Missing PIN", "You enabled 'Set PIN/PSWD' but PIN is empty.\nEnter 4-digit PIN:") or "").strip()
             if not ans:
                 return None
             self.pin_var.set(ans)
             pin = ans
 
-        if pin and (not pin.isdigit() or len(pin) != 4):
-            self._show_error("PIN invalid", "PIN must be exactly 4 digits.")
+        pin_error = _validate_pin(pin)
+        if pin_error:
+            self._show_error("PIN invalid", pin_error)
             return None
 
         try:
@@ -957,9 +1088,10 @@ class SetupApp:
                 self._show_error("Ports duplicate", "MASTER and SLAVE must differ.")
                 return None
 
-        pin = self.pin_pair_var.get().strip() or None
-        if pin and (not pin.isdigit() or len(pin) != 4):
-            self._show_error("PIN invalid", "PIN must be exactly 4 digits or blank.")
+        pin = self._opt(self.pin_pair_var)
+        pin_error = _validate_pin(pin)
+        if pin_error:
+            self._show_error("PIN invalid", pin_error)
             return None
         try:
             baud = int(self.baud_pair_var.get().strip())
@@ -980,16 +1112,12 @@ class SetupApp:
         flags.show_plan = advanced_mode or flags.dry_run
 
         if advanced_mode and flags.basic:
-            skip_steps = set()
-            for sid, var in self.slave_step_vars.items():
-                if not var.get() and sid not in self.slave_critical:
-                    if sid == "addr" and mode == "one":
-                        self.slave_step_vars[sid].set(True)
-                        continue
-                    skip_steps.add(sid)
-            for sid, var in self.master_step_vars.items():
-                if not var.get() and sid not in self.master_critical:
-                    skip_steps.add(sid)
+            slave_ids = self._noncrit_slave
+            if mode == "one":
+                self.slave_step_vars["addr"].set(True)
+                slave_ids = self._noncrit_slave_one
+            skip_steps = {sid for sid in slave_ids if not self.slave_step_vars[sid].get()}
+            skip_steps.update(sid for sid in self._noncrit_master if not self.master_step_vars[sid].get())
             flags.skip_steps = skip_steps
 
         flags.extra_slave_cmds = self._collect_extra_commands(self.extra_slave_text) if advanced_mode else []
@@ -1000,72 +1128,84 @@ class SetupApp:
             "port": master_port,
             "master_port": master_port,
             "slave_port": slave_port,
-            "name_master": self.name_master_var.get().strip() or None,
-            "name_slave": self.name_slave_var.get().strip() or None,
+            "name_master": self._opt(self.name_master_var),
+            "name_slave": self._opt(self.name_slave_var),
             "pin": pin,
             "baud": baud,
             "flags": flags,
         }
 
     def _collect_extra_commands(self, widget: tk.Text) -> List[str]:
-        content = widget.get("1.0", "end")
-        return [line.strip() for line in content.splitlines() if line.strip()]
+        # Text's modified flag is set by every edit, so an unset flag means the last parse still holds.
+        key = str(widget)
+        cached = self._extra_cache.get(key)
+        if cached is None or widget.edit_modified():
+            content = widget.get("1.0", "end")
+            cached = [cmd for line in content.splitlines() if (cmd := line.strip())]
+            self._extra_cache[key] = cached
+            widget.edit_modified(False)
+        return list(cached)
 
     # -------------------------
     # Worker control
     # -------------------------
     def _set_controls_running(self, running: bool) -> None:
-        if running:
-            self.detect_btn.configure(state="disabled")
-            self.run_btn.configure(state="disabled")
-            self.stop_btn.configure(state="normal")
-            self.pair_detect_btn.configure(state="disabled")
-            self.pair_run_btn.configure(state="disabled")
-            self.pair_stop_btn.configure(state="normal")
-        else:
-            self.detect_btn.configure(state="normal")
-            self.run_btn.configure(state="normal")
-            self.stop_btn.configure(state="disabled")
-            self.pair_detect_btn.configure(state="normal")
-            self.pair_run_btn.configure(state="normal")
-            self.pair_stop_btn.configure(state="disabled")
+        # Only this method changes these buttons, so the last state set is known without cget.
+        if running == self._controls_running:
+            return
+        self._controls_running = running
+        run_state, stop_state = ("disabled", "normal") if running else ("normal", "disabled")
+        for btn in self._run_buttons:
+            btn.configure(state=run_state)
+        for btn in self._stop_buttons:
+            btn.configure(state=stop_state)
 
     def _start_worker(self, mode: str, params: dict) -> None:
-        if self.worker and self.worker.is_alive():
+        if self._busy:
             self._show_warn("Running", "A task is already running. Stop/Cancel first.")
             return
+        self._busy = True
 
         self.log_text.configure(state="normal")
         self.log_text.delete("1.0", "end")
         self.log_text.configure(state="disabled")
+        self._log_lines = 0
 
         self.stop_event = threading.Event()
         self._set_controls_running(True)
         self._set_status("Running...", "blue")
+        self._jobs.put((mode, params))
 
-        def worker():
+    def _worker_loop(self) -> None:
+        """
+        Body of the worker thread started in __init__; _start_worker only enqueues.
+        Every wait on this thread must block in the OS with the GIL released:
+        _jobs.get(), ser.read() with a timeout (hc_core never spins on in_waiting),
+        Event.wait() for cancel/backoff and for _ui_sync. A polling loop here would
+        compete with the Tk thread for the GIL and stall the log view.
+        """
+        handlers: Dict[str, Callable[[dict], bool]] = {
+            "detect": self._do_detect,
+            "single-setup": self._do_single_setup,
+            "pair-detect": self._do_pair_detect,
+            "pair-run": self._do_pair_run,
+        }
+        while True:
+            mode, params = self._jobs.get()
             success = False
             try:
-                if mode == "detect":
-                    success = self._do_detect(params)
-                elif mode == "single-setup":
-                    success = self._do_single_setup(params)
-                elif mode == "pair-detect":
-                    success = self._do_pair_detect(params)
-                elif mode == "pair-run":
-                    success = self._do_pair_run(params)
+                handler = handlers.get(mode)
+                if handler is not None:
+                    success = handler(params)
             except Exception as exc:
                 self._append_log(f"[EXCEPTION] {exc!r}")
                 success = False
             finally:
-                self.root.after(0, lambda: self._finish_worker(success))
-
-        self.worker = threading.Thread(target=worker, daemon=True)
-        self.worker.start()
+                self._post_ui(functools.partial(self._finish_worker, success))
 
     def _finish_worker(self, success: bool) -> None:
         self._set_controls_running(False)
-        self.worker = None
+        self._busy = False
         self.stop_event = None
         if not success and self.status_var.get() == "Running...":
             self._set_status("Failed", "red")
@@ -1076,31 +1216,106 @@ class SetupApp:
     def _do_detect(self, params: dict) -> bool:
         res = detect_module(params["port"], logger=self._append_log, stop_event=self.stop_event)
         if not res:
+            self._detect_cache.pop(params["port"], None)
             self._append_log("[FAIL] Detect failed.")
             self._set_status("Detect failed", "red")
             self._show_error("Detect failed", "Could not detect module.\n\nCheck wiring and AT mode.")
             return False
 
         self.last_detected_module = res.module
+        self._detect_cache[params["port"]] = (time.monotonic(), res)
         self._append_log(f"[DETECT] {res.module.upper()} using {res.profile.baud} / {res.profile.line_ending}")
         if res.role_response.strip():
             self._append_log(f"[DETECT] ROLE? {res.role_response.strip()}")
 
         self._set_status(f"Detected {res.module.upper()}", "green")
-        self._ui_sync(lambda: self._on_single_inputs_changed())
+        self._ui_sync(self._on_single_inputs_changed)
         return True
 
+    def _log_addr_response(self, resp: str, *, unparsed: str) -> None:
+        parsed = parse_addr_response(resp or "")
+        if parsed:
+            self._append_log(f"[ADDR] {parsed[0]}  (use: {parsed[1]})")
+        else:
+            self._append_log(f"[ADDR] {unparsed}")
+
+    def _plan_hc05(self, params: dict) -> List[_SetupCmd]:
+        steps = params["steps"]
+        name: Optional[str] = params["name"]
+        pin: Optional[str] = params["pin"]
+        plan = [_SetupCmd("AT", "AT failed", retries=2)]
+        if steps["set_name"] and name:
+            plan.append(_SetupCmd(f"AT+NAME={name}", "NAME failed"))
+        if steps["set_pin"] and pin:
+            plan.append(
+                _SetupCmd(
+                    f"AT+PSWD={pin}",
+                    "PIN/PSWD failed",
+                    fallback=f"AT+PIN={pin}",
+                    fallback_note=".. AT+PSWD failed; trying AT+PIN=xxxx",
+                )
+            )
+        if steps["set_uart"]:
+            plan.append(_SetupCmd(f"AT+UART={params['baud']},0,0", "UART failed"))
+        if steps["set_role"]:
+            plan.append(_SetupCmd(f"AT+ROLE={1 if params['role'] == 'master' else 0}", "ROLE failed"))
+        if steps["read_addr"]:
+            on_addr = functools.partial(self._log_addr_response, unparsed="(could not parse)")
+            plan.append(_SetupCmd("AT+ADDR?", expect_ok=False, on_response=on_addr))
+        if steps["reset"]:
+            plan.append(_SetupCmd("AT+RESET", expect_ok=False))
+        return plan
+
+    def _plan_hc06(self, params: dict) -> List[_SetupCmd]:
+        steps = params["steps"]
+        name: Optional[str] = params["name"]
+        pin: Optional[str] = params["pin"]
+        plan = [_SetupCmd("AT", "AT failed", retries=2)]
+        if steps["set_name"] and name:
+            plan.append(
+                _SetupCmd(
+                    f"AT+NAME{name}",
+                    "NAME failed",
+                    fallback=f"AT+NAME={name}",
+                    fallback_note=".. NAME without '=' failed; trying AT+NAME=<name>",
+                )
+            )
+        if steps["set_pin"] and pin:
+            plan.append(
+                _SetupCmd(
+                    f"AT+PIN{pin}",
+                    "PIN failed",
+                    fallback=f"AT+PSWD={pin}",
+                    fallback_note=".. PINxxxx failed; trying AT+PSWD=xxxx",
+                )
+            )
+        if steps["set_uart"]:
+            baud: int = params["baud"]
+            code = HC06_BAUD_MAP.get(int(baud))
+            if not code:
+                raise RuntimeError(f"Baud {baud} not in HC-06 BAUD map.")
+            plan.append(_SetupCmd(f"AT+BAUD{code}", "BAUD failed"))
+        if steps["read_addr"]:
+            on_addr = functools.partial(self._log_addr_response, unparsed="(likely unsupported on this HC-06)")
+            plan.append(_SetupCmd("AT+ADDR?", expect_ok=False, on_response=on_addr))
+        return plan
+
     def _do_single_setup(self, params: dict) -> bool:
         port: str = params["port"]
         module_sel: str = params["module"]
-        name: Optional[str] = params["name"]
-        pin: Optional[str] = params["pin"]
-        baud: int = params["baud"]
-        role: str = params["role"]
         steps = params["steps"]
 
-        det = detect_module(port, logger=self._append_log, stop_event=self.stop_event)
+        cached = self._detect_cache.get(port)
+        age = time.monotonic() - cached[0] if cached is not None else _DETECT_CACHE_TTL
+        if cached is not None and age < _DETECT_CACHE_TTL:
+            det: Optional[DetectionResult] = cached[1]
+            self._append_log(f"[DETECT] Reusing {cached[1].module.upper()} detected {age:.0f}s ago (press Detect to re-probe)")
+        else:
+            det = detect_module(port, logger=self._append_log, stop_event=self.stop_event)
+            if det:
+                self._detect_cache[port] = (time.monotonic(), det)
         if not det:
+            self._detect_cache.pop(port, None)
             self._append_log("[FAIL] Detect failed. Cannot run setup.")
             self._set_status("Setup failed", "red")
             self._show_error("Setup failed", "Detect failed. Check wiring and AT mode.")
@@ -1114,80 +1329,26 @@ class SetupApp:
         profile = det.profile
         self._append_log(f"[SETUP] Using profile {profile.baud}/{profile.line_ending} on {port} ({use_module.upper()})")
 
+        log = self._append_log
+        stop_event = self.stop_event
         try:
+            # Built before the port opens: a bad HC-06 baud fails without touching the module.
+            plan = self._plan_hc05(params) if use_module == "hc05" else self._plan_hc06(params)
             with serial.Serial(port, baudrate=profile.baud, timeout=0.8, write_timeout=1) as ser:
-                ok, _ = send_command(ser, "AT", profile, expect_ok=True, retries=2, logger=self._append_log, stop_event=self.stop_event)
-                if not ok:
-                    raise RuntimeError("AT failed")
-
-                if use_module == "hc05":
-                    if steps["set_name"] and name:
-                        ok, _ = send_command(ser, f"AT+NAME={name}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            raise RuntimeError("NAME failed")
-
-                    if steps["set_pin"] and pin:
-                        ok, _ = send_command(ser, f"AT+PSWD={pin}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            self._append_log(".. AT+PSWD failed; trying AT+PIN=xxxx")
-                            ok, _ = send_command(ser, f"AT+PIN={pin}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            raise RuntimeError("PIN/PSWD failed")
-
-                    if steps["set_uart"]:
-                        ok, _ = send_command(ser, f"AT+UART={baud},0,0", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            raise RuntimeError("UART failed")
-
-                    if steps["set_role"]:
-                        rv = 0 if role != "master" else 1
-                        ok, _ = send_command(ser, f"AT+ROLE={rv}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            raise RuntimeError("ROLE failed")
-
-                    if steps["read_addr"]:
-                        _, resp = send_command(ser, "AT+ADDR?", profile, expect_ok=False, logger=self._append_log, stop_event=self.stop_event)
-                        parsed = parse_addr_response(resp or "")
-                        if parsed:
-                            self._append_log(f"[ADDR] {parsed[0]}  (use: {parsed[1]})")
-                        else:
-                            self._append_log("[ADDR] (could not parse)")
-
-                    if steps["reset"]:
-                        send_command(ser, "AT+RESET", profile, expect_ok=False, logger=self._append_log, stop_event=self.stop_event)
-
-                else:
-                    if steps["set_name"] and name:
-                        ok, _ = send_command(ser, f"AT+NAME{name}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            self._append_log(".. NAME without '=' failed; trying AT+NAME=<name>")
-                            ok, _ = send_command(ser, f"AT+NAME={name}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            raise RuntimeError("NAME failed")
-
-                    if steps["set_pin"] and pin:
-                        ok, _ = send_command(ser, f"AT+PIN{pin}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            self._append_log(".. PINxxxx failed; trying AT+PSWD=xxxx")
-                            ok, _ = send_command(ser, f"AT+PSWD={pin}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            raise RuntimeError("PIN failed")
-
-                    if steps["set_uart"]:
-                        code = HC06_BAUD_MAP.get(int(baud))
-                        if not code:
-                            raise RuntimeError(f"Baud {baud} not in HC-06 BAUD map.")
-                        ok, _ = send_command(ser, f"AT+BAUD{code}", profile, expect_ok=True, logger=self._append_log, stop_event=self.stop_event)
-                        if not ok:
-                            raise RuntimeError("BAUD failed")
-
-                    if steps["read_addr"]:
-                        _, resp = send_command(ser, "AT+ADDR?", profile, expect_ok=False, logger=self._append_log, stop_event=self.stop_event)
-                        parsed = parse_addr_response(resp or "")
-                        if parsed:
-                            self._append_log(f"[ADDR] {parsed[0]}  (use: {parsed[1]})")
-                        else:
-                            self._append_log("[ADDR] (likely unsupported on this HC-06)")
+                for step in plan:
+                    ok, resp = send_command(
+                        ser, step.command, profile, expect_ok=step.expect_ok, retries=step.retries, logger=log, stop_event=stop_event
+                    )
+                    if not ok and step.fallback:
+                        log(step.fallback_note)
+                        ok, resp = send_command(ser, step.fallback, profile, expect_ok=step.expect_ok, logger=log, stop_event=stop_event)
+                    if step.on_response is not None:
+                        step.on_response(resp)
+                    if not ok and step.fail_msg:
+                        raise RuntimeError(step.fail_msg)
+            if steps["set_uart"] or steps["reset"]:
+                # New baud (HC-06 switches at once) or a restart: the cached profile may be stale.
+                self._detect_cache.pop(port, None)
 
             if self.stop_event and self.stop_event.is_set():
                 self._set_status("Cancelled", "orange")
@@ -1199,6 +1360,8 @@ class SetupApp:
             return True
 
         except (SerialException, RuntimeError) as exc:
+            # Unplugged adapter or wrong profile: detect again next time.
+            self._detect_cache.pop(port, None)
             if self.stop_event and self.stop_event.is_set():
                 self._set_status("Cancelled", "orange")
                 self._show_warn("Cancelled", "Task stopped.")
@@ -1219,10 +1382,12 @@ class SetupApp:
             ports.append(("MASTER", params["master_port"]))
             ports.append(("SLAVE", params["slave_port"]))
 
+        # Probe MASTER and SLAVE ports concurrently; logs are prefixed with the port.
+        results = detect_modules([port for _, port in ports], logger=self._append_log, stop_event=self.stop_event)
         for label, port in ports:
             if self.stop_event and self.stop_event.is_set():
                 break
-            res = detect_module(port, logger=lambda m, lbl=label: self._append_log(f"[{lbl}] {m}"), stop_event=self.stop_event)
+            res = results.get(port)
             if not res:
                 self._append_log(f"[{label}] Detect failed.")
                 success = False
@@ -1233,25 +1398,21 @@ class SetupApp:
         return success
 
     def _do_pair_run(self, params: dict) -> bool:
+        self._detect_cache.clear()  # pairing rewrites ROLE/UART and resets the modules
+
         def prompt_swap(msg: str, default_port: str) -> str:
             ans = self._ask_string("Swap to MASTER", f"{msg}\nMASTER port (Enter to keep {default_port}):")
             ans = (ans or "").strip()
             return ans or default_port
 
         def choose_addr_cb(addrs):
-            if not addrs:
-                return None
-            if len(addrs) == 1:
-                return addrs[0]
-            options = "\n".join(f"[{idx+1}] {a[0]} (use {a[1]})" for idx, a in enumerate(addrs))
-            ans = self._ask_string("Select INQ address", f"Found:\n{options}\n\nEnter number (1-{len(addrs)}) or Cancel:")
-            if not ans:
-                return None
-            ans = ans.strip()
-            if ans.isdigit():
-                i = int(ans)
-                if 1 <= i <= len(addrs):
-                    return addrs[i - 1]
+            if len(addrs) <= 1:
+                return addrs[0] if addrs else None
+            # Format everything before handing over to the Tk thread; the dialog only displays it.
+            options = "\n".join(f"[{i}] {raw} (use {bind})" for i, (raw, bind) in enumerate(addrs, start=1))
+            ans = (self._ask_string("Select INQ address", f"Found:\n{options}\n\nEnter number (1-{len(addrs)}) or Cancel:") or "").strip()
+            if ans.isdecimal() and 1 <= (i := int(ans)) <= len(addrs):
+                return addrs[i - 1]
             return None
 
         ok = run_pair(
@@ -1295,18 +1456,37 @@ class SetupApp:
     # -------------------------
     def _append_log(self, line: str) -> None:
         self.log_queue.put(line)
-
-    def _poll_log_queue(self) -> None:
+        # Wake the Tk thread once per burst instead of polling on a timer.
+        if not self._log_drain_pending:
+            self._log_drain_pending = True
+            self._post_ui(self._drain_log_queue)
+
+    def _drain_log_queue(self) -> None:
+        # Clear the flag first: a line queued during the drain then posts a fresh wakeup.
+        self._log_drain_pending = False
+        # Drain everything queued since the wakeup into a single insert/see.
+        buf: List[str] = []
         try:
             while True:
-                line = self.log_queue.get_nowait()
-                self.log_text.configure(state="normal")
-                self.log_text.insert("end", line + "\n")
-                self.log_text.see("end")
-                self.log_text.configure(state="disabled")
+                buf.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
-        self.root.after(100, self._poll_log_queue)
+        if buf:
+            if len(buf) > self._log_max_lines:
+                # A burst longer than the cap: skip lines the trim below would drop anyway.
+                del buf[: -self._log_max_lines]
+            buf.append("")
+            block = "\n".join(buf)
+            self.log_text.configure(state="normal")
+            self.log_text.insert("end", block)
+            # Count lines here instead of asking Tk; entries may span several lines.
+            self._log_lines += block.count("\n")
+            excess = self._log_lines - self._log_max_lines
+            if excess > self._log_trim_slack:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self._log_lines = self._log_max_lines
+            self.log_text.configure(state="disabled")
+            self.log_text.see("end")
 
     def _set_status(self, text: str, color: str) -> None:
         self.status_var.set(text)
@@ -1333,6 +1513,11 @@ class SetupApp:
         adv = self.advanced_var.get()
         basic = self.basic_var.get()
         mode = self.mode_var.get().lower()
+        # The widget/var sync below depends only on these three; skip repeat fires.
+        key = (adv, basic, mode)
+        if key == self._adv_state_key:
+            return
+        self._adv_state_key = key
 
         for widget in (self.basic_check, self.dry_run_check, self.no_orlg_check, self.no_rmaad_check):
             widget.state(["!disabled"] if adv else ["disabled"])
@@ -12,15 +12,23 @@ Behavior:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+try:  # optional: faster JSON; profiles stay plain JSON either way
+    import orjson
+except ImportError:
+    orjson = None
 
 from hc_core import (
     PairFlags,
     describe_profile,
     format_port_entry,
+    is_valid_pin,
     list_serial_ports,
     run_pair,
     run_setup,
@@ -32,6 +40,24 @@ from hc_core import (
 # Helpers: ports / prompts
 # -------------------------
 
+# Last non-empty enumeration per wired_only. It is kept for the whole run, so
+# back-to-back prompts (MASTER then SLAVE) skip a second WMI/IOKit scan however
+# long the user takes; only an explicit rescan ("r" in a picker) refreshes it.
+_PORT_CACHE: Dict[bool, List] = {}
+
+# _prompt_choice result when the user asks for a rescan.
+_RESCAN = 0
+
+
+def _cached_list_serial_ports(*, wired_only: bool = False, refresh: bool = False) -> List:
+    cached = _PORT_CACHE.get(wired_only)
+    if cached and not refresh:
+        return cached
+    ports = list_serial_ports(wired_only=wired_only)
+    _PORT_CACHE[wired_only] = ports
+    return ports
+
+
 def print_port_menu(port_infos: List) -> None:
     for idx, p in enumerate(port_infos, start=1):
         print(f"[{idx}] {format_port_entry(p)}")
@@ -39,39 +65,80 @@ def print_port_menu(port_infos: List) -> None:
 
 def pick_port_interactive(title: str, exclude: Optional[set[str]] = None) -> Optional[str]:
     exclude = exclude or set()
-    ports = [p for p in list_serial_ports() if p.device not in exclude]
-    if not ports:
-        print(f"!! No serial ports available for {title}.")
-        return None
+    refresh = False
+    while True:
+        # Pickers only offer ports an AT-mode module can be wired to; --list-ports shows all.
+        ports = [p for p in _cached_list_serial_ports(wired_only=True, refresh=refresh) if p.device not in exclude]
+        refresh = True
+        if not ports:
+            print(f"!! No serial ports available for {title}.")
+            return None
 
-    if len(ports) == 1:
-        only = ports[0]
-        prompt = f"Use port {format_port_entry(only)} for {title}? (Y/n) "
-        choice = input(prompt).strip().lower()
-        if choice in ("", "y", "yes"):
-            return only.device
-        print("Cancelled.")
-        return None
+        if len(ports) == 1:
+            only = ports[0]
+            prompt = f"Use port {format_port_entry(only)} for {title}? (Y/n, r=rescan) "
+            choice = input(prompt).strip().lower()
+            if choice == "r":
+                continue
+            if choice in ("", "y", "yes"):
+                return only.device
+            print("Cancelled.")
+            return None
 
-    print(f"Select serial port for {title}:")
-    print_port_menu(ports)
-    attempts = 0
-    while attempts < 3:
-        choice = input(f"Choose port (1-{len(ports)}) or Enter to cancel: ").strip()
+        print(f"Select serial port for {title}:")
+        print_port_menu(ports)
+        idx = _prompt_choice("Choose port", len(ports), allow_rescan=True)
+        if idx != _RESCAN:
+            return ports[idx - 1].device if idx is not None else None
+
+
+def _prompt_choice(prompt: str, n: int, attempts: int = 3, *, allow_rescan: bool = False) -> Optional[int]:
+    """
+    Ask for a number in 1..n; returns it, or None on Enter / after `attempts` bad answers.
+    With allow_rescan, "r" returns _RESCAN.
+    """
+    rescan = ", r to rescan," if allow_rescan else ""
+    message = f"{prompt} (1-{n}){rescan} or Enter to cancel: "
+    valid = range(1, n + 1)
+    for _ in range(attempts):
+        choice = input(message).strip()
         if choice == "":
-            print("Cancelled by user request.")
             return None
-        if choice.isdigit():
-            idx = int(choice)
-            if 1 <= idx <= len(ports):
-                return ports[idx - 1].device
-        attempts += 1
+        if allow_rescan and choice.lower() == "r":
+            return _RESCAN
+        # isdecimal, not isdigit: int() rejects digits like "²" that isdigit accepts.
+        if choice.isdecimal() and (idx := int(choice)) in valid:
+            return idx
         print("Invalid choice, try again.")
-
     print("Too many invalid attempts.")
     return None
 
 
+def _try_low_latency(device: str) -> bool:
+    """
+    Best effort: FTDI-style USB-serial drivers hold received bytes up to 16 ms
+    (latency_timer) before passing them on, which each AT round trip waits out.
+    Linux only; without write access to sysfs (root or a udev rule) this is a no-op.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    name = os.path.basename(os.path.realpath(device))  # /dev/serial/by-id/... -> ttyUSB0
+    timer = Path("/sys/bus/usb-serial/devices") / name / "latency_timer"
+    try:
+        timer.write_text("1")
+    except OSError:
+        return False
+    return True
+
+
+def _apply_low_latency(devices) -> None:
+    for device in dict.fromkeys(devices):
+        if _try_low_latency(device):
+            print(f"Low latency: {device} latency_timer = 1 ms")
+        else:
+            print(f"!! Could not set low latency on {device} (Linux usb-serial only; needs write access to sysfs)")
+
+
 def prompt_input(prompt: str, default: Optional[str] = None) -> str:
     suffix = f" [{default}]" if default is not None and default != "" else ""
     return input(f"{prompt}{suffix}: ").strip() or (default or "")
@@ -85,10 +152,12 @@ def prompt_yes_no(prompt: str, default_yes: bool = True) -> bool:
     return ans in ("y", "yes")
 
 
-def _parse_skip_steps(skip_csv: Optional[str]) -> set:
+@functools.lru_cache(maxsize=64)
+def _parse_skip_steps(skip_csv: Optional[str]) -> FrozenSet[str]:
+    # Frozen so the cached result can be shared; callers union it into their own set.
     if not skip_csv:
-        return set()
-    return {token.strip().lower() for token in skip_csv.split(",") if token.strip()}
+        return frozenset()
+    return frozenset(tok for token in skip_csv.split(",") if (tok := token.strip().lower()))
 
 
 # -------------------------
@@ -110,7 +179,35 @@ def _flags_to_dict(flags: PairFlags) -> dict:
     }
 
 
+# Profiles saved since _v=1 hold only {"_v": 1, "flags": <merged PairFlags>}.
+_PROFILE_VERSION = 1
+_PROFILE_BOOL_KEYS = ("basic", "no_orlg", "no_rmaad", "dry_run", "advanced", "interactive", "show_plan")
+_PROFILE_LIST_KEYS = ("skip_steps", "extra_master_cmds", "extra_slave_cmds")
+
+
+def _flags_from_v1(flags_data: object) -> PairFlags:
+    """Strict reader for a _v=1 "flags" object; raises ValueError on unknown keys or wrong types."""
+    if not isinstance(flags_data, dict):
+        raise ValueError('"flags" must be an object')
+    unknown = flags_data.keys() - {*_PROFILE_BOOL_KEYS, *_PROFILE_LIST_KEYS}
+    if unknown:
+        raise ValueError(f"unknown flag(s): {', '.join(sorted(unknown))}")
+    for key in _PROFILE_BOOL_KEYS:
+        if key in flags_data and not isinstance(flags_data[key], bool):
+            raise ValueError(f'"{key}" must be true or false')
+    for key in _PROFILE_LIST_KEYS:
+        value = flags_data.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise ValueError(f'"{key}" must be a list of strings')
+    flags = PairFlags(**flags_data)  # missing keys keep the PairFlags defaults
+    flags.skip_steps = set(flags.skip_steps)
+    return flags
+
+
 def _flags_from_data(data: dict) -> PairFlags:
+    if data.get("_v") == _PROFILE_VERSION:
+        return _flags_from_v1(data.get("flags"))
+
     # Backward/forward compatible: allow either flat flags or {"slave":..., "master":...}
     if "slave" in data or "master" in data:
         slave_data = data.get("slave", {}) or {}
@@ -142,9 +239,20 @@ def _flags_from_data(data: dict) -> PairFlags:
     )
 
 
+def _json_loads(data: bytes):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps_pretty(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
 def _load_profile_file(path: Path) -> Optional[PairFlags]:
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw = _json_loads(path.read_bytes())
     except FileNotFoundError:
         print(f"!! Profile file not found: {path}")
         return None
@@ -154,13 +262,19 @@ def _load_profile_file(path: Path) -> Optional[PairFlags]:
     except Exception as exc:
         print(f"!! Error reading profile {path}: {exc}")
         return None
-    return _flags_from_data(raw)
+    try:
+        return _flags_from_data(raw)
+    except ValueError as exc:
+        print(f"!! Invalid profile {path}: {exc}")
+        return None
 
 
 def _save_profile_file(path: Path, slave_flags: PairFlags, master_flags: PairFlags) -> None:
-    payload = {"slave": _flags_to_dict(slave_flags), "master": _flags_to_dict(master_flags)}
+    # Merge once here with the legacy {slave, master} rules; only the result is stored.
+    merged = _flags_from_data({"slave": _flags_to_dict(slave_flags), "master": _flags_to_dict(master_flags)})
+    payload = {"_v": _PROFILE_VERSION, "flags": _flags_to_dict(merged)}
     try:
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        path.write_bytes(_json_dumps_pretty(payload))
         print(f"Saved profile to {path}")
     except Exception as exc:
         print(f"!! Could not save profile to {path}: {exc}")
@@ -211,7 +325,7 @@ def wizard_setup_fill(args: argparse.Namespace) -> Optional[argparse.Namespace]:
         if not pin:
             args.pin = None
             break
-        if pin.isdigit() and len(pin) == 4:
+        if is_valid_pin(pin):
             args.pin = pin
             break
         print("PIN must be exactly 4 digits or blank to skip.")
@@ -284,7 +398,7 @@ def wizard_pair_fill(args: argparse.Namespace) -> Optional[argparse.Namespace]:
     # PIN (required for pair; default 1234)
     while True:
         pin = prompt_input("PIN (4 digits)", args.pin or "1234")
-        if pin.isdigit() and len(pin) == 4:
+        if is_valid_pin(pin):
             args.pin = pin
             break
         print("PIN must be exactly 4 digits.")
@@ -351,6 +465,7 @@ def _print_setup_checklist(module: str, name: Optional[str], pin: Optional[str],
 # CLI parser
 # -------------------------
 
+@functools.lru_cache(maxsize=1)
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Detect and configure HC-05 / HC-06 modules via AT commands.",
@@ -401,6 +516,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="List available serial ports and exit.",
     )
+    parser.add_argument(
+        "--low-latency",
+        action="store_true",
+        help="Linux: set the USB-serial latency timer to 1 ms (needs write access to sysfs).",
+    )
 
     sub = parser.add_subparsers(dest="command")
 
@@ -432,6 +552,13 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="List available serial ports and exit.",
     )
+    pair.add_argument(
+        "--low-latency",
+        action="store_true",
+        # SUPPRESS: do not reset a root-level `--low-latency pair ...` back to False.
+        default=argparse.SUPPRESS,
+        help="Linux: set the USB-serial latency timer to 1 ms (needs write access to sysfs).",
+    )
     pair.add_argument(
         "--no-orig",
         action="store_true",
@@ -510,7 +637,7 @@ def build_parser() -> argparse.ArgumentParser:
 
 def handle_setup(args: argparse.Namespace) -> int:
     if args.list_ports:
-        ports = list_serial_ports()
+        ports = _cached_list_serial_ports()
         if not ports:
             print("No ports detected.")
             return 0
@@ -527,8 +654,11 @@ def handle_setup(args: argparse.Namespace) -> int:
             return 2
         args.port = port
 
+    if args.low_latency:
+        _apply_low_latency([args.port])
+
     # Validate PIN if provided via CLI.
-    if args.pin and (not args.pin.isdigit() or len(args.pin) != 4):
+    if args.pin and not is_valid_pin(args.pin):
         print("PIN must be exactly 4 digits.")
         return 1
     if args.baud <= 0:
@@ -579,23 +709,13 @@ def _choose_addr_cli(addrs: List[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
     print("Select SLAVE address found via INQ:")
     for idx, addr in enumerate(addrs, start=1):
         print(f"[{idx}] {addr[0]} (use: {addr[1]})")
-    attempts = 0
-    while attempts < 3:
-        choice = input(f"Choose (1-{len(addrs)}) or Enter to cancel: ").strip()
-        if choice == "":
-            return None
-        if choice.isdigit():
-            idx = int(choice)
-            if 1 <= idx <= len(addrs):
-                return addrs[idx - 1]
-        attempts += 1
-        print("Invalid choice.")
-    return None
+    idx = _prompt_choice("Choose", len(addrs))
+    return addrs[idx - 1] if idx is not None else None
 
 
 def handle_pair(args: argparse.Namespace) -> int:
     if args.list_ports:
-        ports = list_serial_ports()
+        ports = _cached_list_serial_ports()
         if not ports:
             print("No ports detected.")
             return 0
@@ -636,6 +756,9 @@ def handle_pair(args: argparse.Namespace) -> int:
             print("MASTER and SLAVE ports must differ.")
             return 1
 
+    if args.low_latency:
+        _apply_low_latency([master_port, slave_port])
+
     # Prompt missing “user input” in CLI (the user asked: PIN/PSWD should be asked)
     if args.name_master is None:
         args.name_master = prompt_input("Name MASTER (optional)", "")
@@ -647,7 +770,7 @@ def handle_pair(args: argparse.Namespace) -> int:
         args.baud = int(prompt_input("Data-mode baud", "9600"))
 
     # Validate PIN/baud
-    if args.pin and (not args.pin.isdigit() or len(args.pin) != 4):
+    if args.pin and not is_valid_pin(args.pin):
         print("PIN must be exactly 4 digits.")
         return 1
     if args.baud <= 0:
@@ -717,7 +840,8 @@ def handle_pair(args: argparse.Namespace) -> int:
 # Main interactive menu
 # -------------------------
 
-def interactive_menu(parser: argparse.ArgumentParser) -> int:
+def interactive_menu(make_parser: Callable[[], argparse.ArgumentParser] = build_parser) -> int:
+    # The parser is only needed for Single Setup defaults; the other entries never build it.
     print("HC-05 / HC-06 Setup Wizard (CLI)")
     print("Tip: Press Enter to choose the default.\n")
     print("[1] Pair MASTER/SLAVE (recommended)")
@@ -730,7 +854,7 @@ def interactive_menu(parser: argparse.ArgumentParser) -> int:
         choice = "1"
 
     if choice == "3":
-        ports = list_serial_ports()
+        ports = _cached_list_serial_ports()
         if not ports:
             print("No ports detected.")
             return 0
@@ -743,7 +867,7 @@ def interactive_menu(parser: argparse.ArgumentParser) -> int:
         return 0
 
     if choice == "2":
-        args = parser.parse_args(["--show-plan"])  # base defaults
+        args = make_parser().parse_args(["--show-plan"])  # base defaults
         filled = wizard_setup_fill(args)
         if not filled:
             print("Cancelled.")
@@ -764,6 +888,7 @@ def interactive_menu(parser: argparse.ArgumentParser) -> int:
         pin="1234",
         baud=9600,
         list_ports=False,
+        low_latency=False,
         no_orig=None,
         no_rmaad=None,
         advanced=None,
@@ -784,12 +909,11 @@ def interactive_menu(parser: argparse.ArgumentParser) -> int:
 
 
 def main() -> int:
-    parser = build_parser()
-
     # If user ran: `python tools/hc_setup_wizard.py` with no args
     if len(sys.argv) == 1:
-        return interactive_menu(parser)
+        return interactive_menu(build_parser)
 
+    parser = build_parser()
     args = parser.parse_args()
 
     # No subcommand -> treat as single setup (legacy behavior)